@@ -1,83 +1,36 @@
-import tkinter as tk
-from tkinter import messagebox, ttk
+import sys
 import time
 from threading import Thread
 import random
-import sys
 
-# Increase recursion limit for backtracking
-sys.setrecursionlimit(10000)
+from puzzle import state as ps
+from puzzle.backtrack import backtrack_moves, ida_star
+from puzzle.trace import FileTrace
+
+# tkinter is imported by load_gui() when the window starts, so the solvers
+# above can be imported on machines without a display stack.
+tk = messagebox = ttk = None
+
+def load_gui():
+    global tk, messagebox, ttk
+    import tkinter as tk
+    from tkinter import messagebox, ttk
 
-def generate_neighbors(state):
-    """Generate all valid neighboring states from current state"""
-    blank_pos = state.index(0)
-    neighbors = []
-    
-    valid_moves = []
-    
-    if blank_pos % 3 != 0:
-        valid_moves.append(-1)
-    if blank_pos % 3 != 2:
-        valid_moves.append(1)
-    if blank_pos // 3 != 0:
-        valid_moves.append(-3)
-    if blank_pos // 3 != 2:
-        valid_moves.append(3)
-    
-    for move_offset in valid_moves:
-        new_blank_pos = blank_pos + move_offset
-        new_state = list(state)
-        new_state[blank_pos], new_state[new_blank_pos] = \
-            new_state[new_blank_pos], new_state[blank_pos]
-        neighbors.append(tuple(new_state))
-    
-    return neighbors
-    
-def pure_backtrack_simple(current, goal, visited, path, explored_states, depth=0, max_depth=100):
-    """
-    Pure Simple Recursive Backtracking Algorithm
-    Now also tracks ALL explored states in order
-    """
-    
-    # Record this state as explored
-    explored_states.append(current)
-    
-    # Base case: goal found
-    if current == goal:
-        return path + [current]
-    
-    # Prevent infinite recursion
-    if depth > max_depth:
-        return None
-    
-    # Mark as visited
-    visited.add(current)
-    
-    # Generate neighbors on-the-fly
-    neighbors = generate_neighbors(current)
-    
-    # Try each unvisited neighbor
-    for neighbor in neighbors:
-        if neighbor not in visited:
-            result = pure_backtrack_simple(neighbor, goal, visited, path + [current], 
-                                          explored_states, depth + 1, max_depth)
-            if result is not None:
-                return result
-    
-    # Backtrack
-    return None
 class EightPuzzleUI:
     """Main UI for 8-Puzzle Game with Dual Visualization"""
     
-    def _init_(self, root):
+    def __init__(self, root, rows=3, cols=3, trace=None):
+        load_gui()
         self.root = root
-        self.root.title("8-Puzzle Solver - Dual Visualization")
+        self.board = ps.get_board(rows, cols)
+        self.title = f"{self.board.size - 1}-Puzzle Solver - Dual Visualization"
+        self.root.title(self.title)
         self.root.geometry("1400x750")
         self.root.configure(bg="#FFFFFF")
         
         # Game state
-        self.current_state = (1, 2, 3, 4, 5, 6, 7, 8, 0)
-        self.goal_state = (1, 2, 3, 4, 5, 6, 7, 8, 0)
+        self.current_state = self.board.goal_tiles
+        self.goal_state = self.board.goal_tiles
         self.move_count = 0
         self.elapsed_time = 0
         self.solving = False
@@ -87,15 +40,19 @@ class EightPuzzleUI:
         self.tile_buttons_right = {}
         self.timer_running = True
         self.status_label = None
+        # Exploration trace sink (see puzzle.trace), made fresh per solve.
+        # The default spills packed states to a temporary file so long
+        # searches replay without holding every state in memory.
+        self.new_trace = trace or (lambda: FileTrace(self.board))
         self.explored_states = []
         self.solution_path = []
         self.exploration_index = 0
         self.solution_index = 0
 
-         # Create UI
+        # Create UI
         self.create_ui()
         self.start_timer()
-     def create_ui(self):
+    def create_ui(self):
         """Create the user interface with dual visualization"""
         
         # Main container
@@ -108,7 +65,7 @@ class EightPuzzleUI:
         
         title_label = tk.Label(
             control_frame,
-            text="8-Puzzle Solver - Dual Visualization",
+            text=self.title,
             font=("Arial", 18, "bold"),
             bg="#FFFFFF",
             fg="#333333"
@@ -159,9 +116,8 @@ class EightPuzzleUI:
         left_grid_frame = tk.Frame(left_puzzle_container, bg="#F5D5E3")
         left_grid_frame.pack(expand=True, pady=10)
         
-        for i in range(9):
-            row = i // 3
-            col = i % 3
+        for i in range(self.board.size):
+            row, col = divmod(i, self.board.cols)
             tile_button = tk.Button(
                 left_grid_frame,
                 text=str(self.current_state[i]) if self.current_state[i] != 0 else "",
@@ -213,9 +169,8 @@ class EightPuzzleUI:
         right_grid_frame = tk.Frame(right_puzzle_container, bg="#E8F8F5")
         right_grid_frame.pack(expand=True, pady=10)
         
-        for i in range(9):
-            row = i // 3
-            col = i % 3
+        for i in range(self.board.size):
+            row, col = divmod(i, self.board.cols)
             tile_button = tk.Button(
                 right_grid_frame,
                 text=str(self.current_state[i]) if self.current_state[i] != 0 else "",
@@ -323,20 +278,10 @@ class EightPuzzleUI:
         shuffled = self.goal_state
         for _ in range(random.randint(10, 20)):
             blank_pos = shuffled.index(0)
-            valid_moves = []
-            
-            if blank_pos % 3 != 0:
-                valid_moves.append(-1)
-            if blank_pos % 3 != 2:
-                valid_moves.append(1)
-            if blank_pos // 3 != 0:
-                valid_moves.append(-3)
-            if blank_pos // 3 != 2:
-                valid_moves.append(3)
+            valid_moves = backtrack_moves(self.board)[blank_pos]
             
             if valid_moves:
-                move = random.choice(valid_moves)
-                new_pos = blank_pos + move
+                new_pos = random.choice(valid_moves)
                 shuffled_list = list(shuffled)
                 shuffled_list[blank_pos], shuffled_list[new_pos] = \
                     shuffled_list[new_pos], shuffled_list[blank_pos]
@@ -350,7 +295,7 @@ class EightPuzzleUI:
     
     def update_both_displays(self, left_state, right_state):
         """Update both puzzle displays"""
-        for i in range(9):
+        for i in range(self.board.size):
             number = left_state[i]
             button = self.tile_buttons_left[i]
             if number == 0:
@@ -358,7 +303,7 @@ class EightPuzzleUI:
             else:
                 button.config(text=str(number), bg="#FFFFFF")
         
-        for i in range(9):
+        for i in range(self.board.size):
             number = right_state[i]
             button = self.tile_buttons_right[i]
             if number == 0:
@@ -376,6 +321,10 @@ class EightPuzzleUI:
             messagebox.showinfo("Already Solved", "The puzzle is already solved!")
             return
         
+        if not self.board.is_solvable(self.board.pack(self.current_state)):
+            messagebox.showinfo("No Solution", "This board cannot be solved.")
+            return
+        
         self.solving = True
         self.status_label.config(text=" Solving and recording exploration...")
         self.root.update()
@@ -384,16 +333,12 @@ class EightPuzzleUI:
             try:
                 start_time = time.time()
                 
-                self.explored_states = []
-                visited = set()
-                self.solution_path = pure_backtrack_simple(
+                self.clear_trace()
+                self.explored_states = self.new_trace()
+                self.solution_path = ida_star(
                     self.current_state,
-                    self.goal_state,
-                    visited,
-                    [],
                     self.explored_states,
-                    depth=0,
-                    max_depth=50
+                    board=self.board
                 )
                 
                 elapsed = time.time() - start_time
@@ -402,7 +347,7 @@ class EightPuzzleUI:
                     messagebox.showinfo(
                         "Solution Found!",
                         f"Time: {elapsed:.2f}s\n"
-                        f"States explored: {len(self.explored_states)}\n"
+                        f"States explored: {self.explored_states.total}\n"
                         f"Solution length: {len(self.solution_path) - 1} moves"
                     )
                     self.animate_dual_visualization()
@@ -410,7 +355,7 @@ class EightPuzzleUI:
                     messagebox.showwarning(
                         "No Solution",
                         f"Could not find solution.\n"
-                        f"States explored: {len(self.explored_states)}"
+                        f"States explored: {self.explored_states.total}"
                     )
                     self.solving = False
                     self.status_label.config(text="✗ No solution found!")
@@ -430,13 +375,14 @@ class EightPuzzleUI:
         def animate():
             self.exploration_index = 0
             self.solution_index = 0
+            explored = iter(self.explored_states)
             total_exploration = len(self.explored_states)
             total_solution = len(self.solution_path)
             
             while self.exploration_index < total_exploration or self.solution_index < total_solution:
                 
                 if self.exploration_index < total_exploration:
-                    current_explored = self.explored_states[self.exploration_index]
+                    current_explored = next(explored)
                     self.update_left_display(current_explored)
                     self.left_info_label.config(
                         text=f"Exploration Progress: {self.exploration_index + 1}/{total_exploration} states"
@@ -459,8 +405,15 @@ class EightPuzzleUI:
         
         Thread(target=animate, daemon=True).start()
     
+    def clear_trace(self):
+        """Release the previous trace (a FileTrace deletes its file)."""
+        close = getattr(self.explored_states, "close", None)
+        if close is not None:
+            close()
+        self.explored_states = []
+    
     def update_left_display(self, state):
-        for i in range(9):
+        for i in range(self.board.size):
             number = state[i]
             button = self.tile_buttons_left[i]
             if number == 0:
@@ -469,7 +422,7 @@ class EightPuzzleUI:
                 button.config(text=str(number), bg="#FFFFFF")
     
     def update_right_display(self, state):
-        for i in range(9):
+        for i in range(self.board.size):
             number = state[i]
             button = self.tile_buttons_right[i]
             if number == 0:
@@ -482,10 +435,10 @@ class EightPuzzleUI:
             messagebox.showwarning("Solving", "Cannot reset while solving!")
             return
         
-        self.current_state = (1, 2, 3, 4, 5, 6, 7, 8, 0)
+        self.current_state = self.goal_state
         self.move_count = 0
         self.elapsed_time = 0
-        self.explored_states = []
+        self.clear_trace()
         self.solution_path = []
         self.exploration_index = 0
         self.solution_index = 0
@@ -497,12 +450,15 @@ class EightPuzzleUI:
     def show_instructions(self):
         messagebox.showinfo(
             "How to Play",
-            "8-Puzzle Solver with Dual Visualization:\n\n"
+            f"{self.board.size - 1}-Puzzle Solver with Dual Visualization:\n\n"
             "LEFT SIDE: Shows the algorithm's exploration process\n"
             "RIGHT SIDE: Shows the final solution path"
         )
 
 if __name__== "__main__":
+    # optional board size: python backtracking.py ROWS COLS
+    rows, cols = map(int, sys.argv[1:3]) if len(sys.argv) > 2 else (3, 3)
+    load_gui()
     root = tk.Tk()
-    app = EightPuzzleUI(root)
+    app = EightPuzzleUI(root, rows, cols)
     root.mainloop()
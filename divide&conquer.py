@@ -1,141 +1,45 @@
-import tkinter as tk
-from tkinter import messagebox
-from PIL import Image, ImageTk
-import random
-import heapq
 import threading
+import queue
 import os
+import sys
 from copy import deepcopy
 
+from puzzle import state as ps
+from puzzle import stream
+from puzzle.dnc import iter_dnc, shuffle_board
+
+# tkinter and PIL are imported by load_gui() when the window starts, so the
+# solver above can be imported on machines without a display stack.
+tk=messagebox=Image=ImageTk=None
+
+def load_gui():
+    global tk,messagebox,Image,ImageTk
+    import tkinter as tk
+    from tkinter import messagebox
+    from PIL import Image, ImageTk
+
 # ------------------ PATH ------------------
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 
 # ------------------ CONSTANTS ------------------
-TILE = 160
 BOARD_SIZE = 480
 BG_COLOR = "misty rose"
 
-GOAL = (1,2,3,4,5,6,7,8,0)
-DIRS=[(-1,0),(1,0),(0,-1),(0,1)]
-
-# -------------------------------------------------
-# MOVE GENERATOR
-# -------------------------------------------------
-def neighbors(state):
-    i=state.index(0)
-    r,c=divmod(i,3)
-    res=[]
-    for dr,dc in DIRS:
-        nr,nc=r+dr,c+dc
-        if 0<=nr<3 and 0<=nc<3:
-            j=nr*3+nc
-            lst=list(state)
-            lst[i],lst[j]=lst[j],lst[i]
-            res.append(tuple(lst))
-    return res
-
-
-# -------------------------------------------------
-# HEURISTIC
-# -------------------------------------------------
-def h(state):
-    dist=0
-    for i,v in enumerate(state):
-        if v==0: continue
-        goal=v-1
-        r1,c1=divmod(i,3)
-        r2,c2=divmod(goal,3)
-        dist+=abs(r1-r2)+abs(c1-c2)
-    return dist
-
-
-# -------------------------------------------------
-# A* SOLVER (CONQUER STEP)
-# -------------------------------------------------
-def astar(start, goal_check):
-
-    pq=[]
-    heapq.heappush(pq,(h(start),0,start,[start]))
-    visited=set()
-
-    while pq:
-        f,g,state,path=heapq.heappop(pq)
-
-        if goal_check(state):
-            return path
-
-        if state in visited:
-            continue
-        visited.add(state)
-
-        for nxt in neighbors(state):
-            if nxt not in visited:
-                heapq.heappush(pq,(g+1+h(nxt),g+1,nxt,path+[nxt]))
-
-    return None
-
-
-# -------------------------------------------------
-# DIVIDE & CONQUER SOLVER
-# -------------------------------------------------
-def dnc_solver(state):
-
-    if state == GOAL:
-        return [state]
-
-    path_total=[state]
-    current=state
-
-    # ---- DIVIDE → solve first row ----
-    if current[:3] != GOAL[:3]:
-
-        def row_goal(s):
-            return s[:3]==GOAL[:3]
-
-        path=astar(current,row_goal)
-        path_total+=path[1:]
-        current=path[-1]
-
-    # ---- CONQUER → solve remaining ----
-    def full_goal(s):
-        return s==GOAL
-
-    path=astar(current,full_goal)
-    path_total+=path[1:]
-
-    # ---- COMBINE ----
-    return path_total
-
-
-# -------------------------------------------------
-# RANDOM BOARD
-# -------------------------------------------------
-def shuffle_board():
-    s=list(GOAL)
-    for _ in range(40):
-        i=s.index(0)
-        r,c=divmod(i,3)
-        moves=[]
-        for dr,dc in DIRS:
-            nr,nc=r+dr,c+dc
-            if 0<=nr<3 and 0<=nc<3:
-                moves.append(nr*3+nc)
-        j=random.choice(moves)
-        s[i],s[j]=s[j],s[i]
-    return tuple(s)
-
 
 # -------------------------------------------------
 # GUI
 # -------------------------------------------------
 class PuzzleApp:
-    def __init__(self, root):
+    def __init__(self, root, rows=3, cols=3):
+        load_gui()
         self.root=root
-        root.title("8 Puzzle - User vs AI (Divide & Conquer)")
+        self.board=ps.get_board(rows,cols)
+        self.title=f"{self.board.size-1} Puzzle - User vs AI (Divide & Conquer)"
+        root.title(self.title)
         root.geometry("1500x800")
         root.configure(bg=BG_COLOR)
 
-        self.user_state=shuffle_board()
+        self.user_state=shuffle_board(self.board)
         self.ai_state=deepcopy(self.user_state)
 
         self.user_steps=0
@@ -156,7 +60,7 @@ class PuzzleApp:
         bar.pack(fill="x")
 
         tk.Label(bar,
-                 text="8 Puzzle - User vs AI (Divide & Conquer)",
+                 text=self.title,
                  bg="Dark slate grey",
                  fg="white",
                  font=("Segoe UI",22,"bold")).pack(pady=10)
@@ -225,8 +129,8 @@ class PuzzleApp:
         board.pack_propagate(False)
 
         tiles=[]
-        for r in range(3):
-            for c in range(3):
+        for r in range(self.board.rows):
+            for c in range(self.board.cols):
                 btn=tk.Button(board,
                               bd=0,
                               bg="black",
@@ -241,15 +145,17 @@ class PuzzleApp:
         try:
             img_path=os.path.join(BASE_DIR,self.image_name)
             img=Image.open(img_path).resize((BOARD_SIZE,BOARD_SIZE))
+            tw=BOARD_SIZE//self.board.cols
+            th=BOARD_SIZE//self.board.rows
             self.cuts=[]
-            for i in range(8):
-                r,c=divmod(i,3)
-                piece=img.crop((c*TILE,r*TILE,
-                                (c+1)*TILE,(r+1)*TILE))
+            for i in range(self.board.size-1):
+                r,c=divmod(i,self.board.cols)
+                piece=img.crop((c*tw,r*th,
+                                (c+1)*tw,(r+1)*th))
                 self.cuts.append(ImageTk.PhotoImage(piece))
             self.cuts.append(None)
         except:
-            self.cuts=[None]*9
+            self.cuts=[None]*self.board.size
 
     def change_image(self,img_name):
         self.image_name=img_name
@@ -273,9 +179,9 @@ class PuzzleApp:
 
     # ---------- USER MOVE ----------
     def move_user(self,r,c):
-        i=r*3+c
+        i=r*self.board.cols+c
         zero=self.user_state.index(0)
-        zr,zc=divmod(zero,3)
+        zr,zc=divmod(zero,self.board.cols)
 
         if abs(r-zr)+abs(c-zc)==1:
             lst=list(self.user_state)
@@ -284,7 +190,7 @@ class PuzzleApp:
             self.user_steps+=1
             self.update_boards()
 
-            if self.user_state==GOAL:
+            if self.user_state==self.board.goal_tiles:
                 messagebox.showinfo(
                     "User Wins",
                     f"You solved in {self.user_steps} steps!"
@@ -294,7 +200,7 @@ class PuzzleApp:
     def shuffle(self):
         if self.solving:
             return
-        self.user_state=shuffle_board()
+        self.user_state=shuffle_board(self.board)
         self.ai_state=deepcopy(self.user_state)
         self.user_steps=0
         self.ai_steps=0
@@ -304,19 +210,30 @@ class PuzzleApp:
     def solve_thread(self):
         if self.solving:
             return
+        if not self.board.is_solvable(self.board.pack(self.ai_state)):
+            messagebox.showinfo("AI Solver","This board cannot be solved.")
+            return
         self.solving=True
-        t=threading.Thread(target=self.solve_ai)
+        self.moves=queue.Queue()
+        t=threading.Thread(target=self.solve_ai,args=(self.ai_state,),daemon=True)
         t.start()
+        self.animate()
 
-    def solve_ai(self):
-        path=dnc_solver(self.ai_state)
-        if not path:
-            self.solving=False
+    # The solver thread hands each move to the UI as soon as its stage is
+    # solved; None marks the end of the path.
+    def solve_ai(self,state):
+        for move in stream.moves(iter_dnc(state,self.board)):
+            self.moves.put(move)
+        self.moves.put(None)
+
+    def animate(self):
+        try:
+            move=self.moves.get_nowait()
+        except queue.Empty:
+            self.root.after(50,self.animate)      # next stage still searching
             return
-        self.animate(path)
 
-    def animate(self,path):
-        if not path:
+        if move is None:
             self.solving=False
             messagebox.showinfo(
                 "AI Finished",
@@ -324,16 +241,19 @@ class PuzzleApp:
             )
             return
 
-        self.ai_state=path.pop(0)
+        self.ai_state=move
         self.ai_steps+=1
         self.update_boards()
-        self.root.after(300,lambda:self.animate(path))
+        self.root.after(300,self.animate)
 
 
 # -------------------------------------------------
 # RUN
 # -------------------------------------------------
 if __name__=="__main__":
+    # optional board size: python "divide&conquer.py" ROWS COLS
+    rows,cols=map(int,sys.argv[1:3]) if len(sys.argv)>2 else (3,3)
+    load_gui()
     root=tk.Tk()
-    PuzzleApp(root)
+    PuzzleApp(root,rows,cols)
     root.mainloop()
\ No newline at end of file
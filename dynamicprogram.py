@@ -1,79 +1,55 @@
-import tkinter as tk
-from tkinter import messagebox
-from PIL import Image, ImageTk
 from copy import deepcopy
 import random
-from collections import deque
 import os
+import queue
+import sys
+import threading
 
-# ------------------ PATH SETUP ------------------
-
-BASE_DIR = os.path.dirname(os.path.abspath(__file__))
-
-# ------------------ CONSTANTS ------------------
-
-TILE = 160
-BOARD_SIZE = 480
-BG_COLOR = "misty rose"
+from puzzle import dp
+from puzzle import state as ps
+from puzzle import stream
+from puzzle.dp import DIRS, build_dp_table, iter_path, iter_bidirectional
 
-GOAL_STATE = (1, 2, 3, 4, 5, 6, 7, 8, 0)
-DIRS = [(-1, 0), (1, 0), (0, -1), (0, 1)]
+# tkinter and PIL are imported by load_gui() when the window starts, so the
+# solvers above can be imported on machines without a display stack.
+tk = messagebox = Image = ImageTk = None
 
-# ------------------ TRUE DP TABLE ------------------
 
-dp_table = {}
+def load_gui():
+    global tk, messagebox, Image, ImageTk
+    import tkinter as tk
+    from tkinter import messagebox
+    from PIL import Image, ImageTk
 
 
-def build_dp_table():
-    if dp_table:
-        return
-
-    queue = deque([GOAL_STATE])
-    dp_table[GOAL_STATE] = None
-
-    while queue:
-        curr = queue.popleft()
-
-        idx = curr.index(0)
-        r, c = divmod(idx, 3)
-
-        for dr, dc in DIRS:
-            nr, nc = r + dr, c + dc
-            if 0 <= nr < 3 and 0 <= nc < 3:
-                ni = nr * 3 + nc
-                nxt = list(curr)
-                nxt[idx], nxt[ni] = nxt[ni], nxt[idx]
-                nxt = tuple(nxt)
-
-                if nxt not in dp_table:
-                    dp_table[nxt] = curr
-                    queue.append(nxt)
-
+# ------------------ PATH SETUP ------------------
 
-def reconstruct_path(start):
-    if start not in dp_table:
-        return []
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 
-    path = [start]
-    curr = start
+# ------------------ CONSTANTS ------------------
 
-    while curr != GOAL_STATE:
-        curr = dp_table[curr]
-        path.append(curr)
+BOARD_SIZE = 480
+BG_COLOR = "misty rose"
 
-    return path
+ENGINE_TABLE = "DP Table"
+ENGINE_BIDIR = "Bidirectional BFS"
 
 
 # ------------------ GUI ------------------
 
 class PuzzleApp:
-    def __init__(self, root):
+    def __init__(self, root, rows=3, cols=3):
+        load_gui()
         self.root = root
-        root.title("8 Puzzle - User vs DP Machine")
+        self.board = ps.get_board(rows, cols)
+        self.has_table = self.board is ps.DEFAULT
+        # Bidirectional BFS refuses boards larger than 3x3 (ps.check_exhaustive)
+        self.can_search = self.board.num_states <= ps.MAX_EXHAUSTIVE_STATES
+        root.title(f"{self.board.size - 1} Puzzle - User vs DP Machine")
         root.geometry("1500x800")
         root.configure(bg=BG_COLOR)
 
-        self.goal_grid = [list(GOAL_STATE[0:3]), list(GOAL_STATE[3:6]), list(GOAL_STATE[6:9])]
+        self.goal_grid = self.board.to_grid(self.board.goal)
 
         self.user_state = deepcopy(self.goal_grid)
         self.ai_state = deepcopy(self.goal_grid)
@@ -92,18 +68,29 @@ class PuzzleApp:
         self.build_sidebar()
         self.build_center()
         self.load_image()
-
-        build_dp_table()
-
         self.update_boards()
 
+        self.table_queue = queue.Queue()
+        self.table_cancel = None
+        if self.has_table:
+            self.start_table_build()
+        else:
+            self.table_btn.config(text="Build Table", state="disabled")
+            if self.can_search:
+                self.table_lbl.config(text=f"DP table: 3x3 only ({self.board.num_states:,} states here)")
+            else:
+                self.table_lbl.config(
+                    text=f"No solver: {self.board.num_states:,} states is too many for BFS"
+                )
+            self.refresh_solve_btn()
+
     def build_top(self):
         bar = tk.Frame(self.root, bg="Dark slate grey", height=80)
         bar.pack(fill="x")
 
         tk.Label(
             bar,
-            text="8 Puzzle - User vs AI",
+            text=f"{self.board.size - 1} Puzzle - User vs AI",
             bg="Dark slate grey",
             fg="white",
             font=("Segoe UI", 22, "bold"),
@@ -142,9 +129,23 @@ class PuzzleApp:
             side="left", padx=10
         )
 
-        tk.Button(controls, text="AI Solve", font=("Segoe UI", 14), width=12, command=self.solve).pack(
-            side="left", padx=10
+        self.solve_btn = tk.Button(
+            controls, text="AI Solve", font=("Segoe UI", 14), width=12, command=self.solve, state="disabled"
+        )
+        self.solve_btn.pack(side="left", padx=10)
+
+        self.table_btn = tk.Button(
+            controls, text="Cancel Build", font=("Segoe UI", 14), width=12, command=self.toggle_table_build
+        )
+        self.table_btn.pack(side="left", padx=10)
+
+        engines = [ENGINE_TABLE, ENGINE_BIDIR] if self.has_table else [ENGINE_BIDIR]
+        self.engine = tk.StringVar(value=engines[0])
+        engine_menu = tk.OptionMenu(
+            controls, self.engine, *engines, command=lambda _: self.refresh_solve_btn()
         )
+        engine_menu.config(font=("Segoe UI", 12), width=16)
+        engine_menu.pack(side="left", padx=10)
 
         self.info = tk.Label(
             center,
@@ -162,6 +163,70 @@ class PuzzleApp:
         )
         self.status_lbl.pack(pady=5)
 
+        self.table_lbl = tk.Label(
+            center,
+            text="DP table: loading...",
+            font=("Segoe UI", 11),
+            bg=BG_COLOR,
+        )
+        self.table_lbl.pack()
+
+    # ---------- DP TABLE (background build) ----------
+
+    def start_table_build(self):
+        cancel = threading.Event()
+        self.table_cancel = cancel
+        self.refresh_solve_btn()
+        self.table_btn.config(text="Cancel Build", state="normal")
+        self.table_lbl.config(text="DP table: loading...")
+
+        def progress(discovered, depth):
+            self.table_queue.put(("progress", discovered, depth))
+
+        def worker():
+            ok = build_dp_table(progress, cancel)
+            self.table_queue.put(("done", ok, None))
+
+        threading.Thread(target=worker, daemon=True).start()
+        self.root.after(100, self.poll_table_build)
+
+    def poll_table_build(self):
+        try:
+            while True:
+                kind, a, b = self.table_queue.get_nowait()
+                if kind == "progress":
+                    self.table_lbl.config(text=f"DP table: {a} states discovered, depth {b}")
+                    continue
+
+                self.table_cancel = None
+                if a:
+                    self.table_lbl.config(text="DP table: ready")
+                    self.table_btn.config(state="disabled")
+                else:
+                    self.table_lbl.config(text="DP table: build cancelled")
+                    self.table_btn.config(text="Build Table", state="normal")
+                self.refresh_solve_btn()
+                return
+        except queue.Empty:
+            pass
+
+        self.root.after(100, self.poll_table_build)
+
+    def refresh_solve_btn(self):
+        # Bidirectional BFS needs no table, so it can solve while one builds.
+        if self.engine.get() == ENGINE_BIDIR:
+            ready = self.can_search
+        else:
+            ready = bool(dp.dp_table)
+        self.solve_btn.config(state="normal" if ready else "disabled")
+
+    def toggle_table_build(self):
+        if self.table_cancel is None:
+            self.start_table_build()
+        else:
+            self.table_cancel.set()
+            self.table_btn.config(state="disabled")
+
     def create_board(self, parent, title, command):
         frame = tk.Frame(parent, bg=BG_COLOR)
         frame.pack(side="left", padx=40)
@@ -173,8 +238,8 @@ class PuzzleApp:
         board.pack_propagate(False)
 
         tiles = []
-        for r in range(3):
-            for c in range(3):
+        for r in range(self.board.rows):
+            for c in range(self.board.cols):
                 b = tk.Button(
                     board,
                     bd=0,
@@ -190,14 +255,16 @@ class PuzzleApp:
         try:
             img_path = os.path.join(BASE_DIR, self.image_name)
             img = Image.open(img_path).resize((BOARD_SIZE, BOARD_SIZE))
+            tw = BOARD_SIZE // self.board.cols
+            th = BOARD_SIZE // self.board.rows
             self.cuts = []
-            for i in range(8):
-                r, c = divmod(i, 3)
-                piece = img.crop((c * TILE, r * TILE, (c + 1) * TILE, (r + 1) * TILE))
+            for i in range(self.board.size - 1):
+                r, c = divmod(i, self.board.cols)
+                piece = img.crop((c * tw, r * th, (c + 1) * tw, (r + 1) * th))
                 self.cuts.append(ImageTk.PhotoImage(piece))
             self.cuts.append(None)
         except Exception:
-            self.cuts = [None] * 9
+            self.cuts = [None] * self.board.size
 
     def change_image(self, img_name):
         self.image_name = img_name
@@ -222,8 +289,8 @@ class PuzzleApp:
                     tiles[i].config(text=str(v), font=("Segoe UI", 26, "bold"), fg="white", bg="black")
 
     def find_zero(self, state):
-        for r in range(3):
-            for c in range(3):
+        for r in range(self.board.rows):
+            for c in range(self.board.cols):
                 if state[r][c] == 0:
                     return r, c
 
@@ -251,7 +318,7 @@ class PuzzleApp:
             zr, zc = self.find_zero(state)
             dr, dc = random.choice(DIRS)
             nr, nc = zr + dr, zc + dc
-            if 0 <= nr < 3 and 0 <= nc < 3:
+            if 0 <= nr < self.board.rows and 0 <= nc < self.board.cols:
                 state[zr][zc], state[nr][nc] = state[nr][nc], 0
 
         self.user_state = deepcopy(state)
@@ -276,30 +343,50 @@ class PuzzleApp:
         if self.ai_solving or self.ai_finished:
             return
 
+        start = tuple(x for row in self.ai_state for x in row)
+        if not self.board.is_solvable(self.board.pack(start)):
+            self.status_lbl.config(text="Status: No solution from current state")
+            messagebox.showinfo("AI Solver", "No solution exists!")
+            return
+
+        use_table = self.engine.get() == ENGINE_TABLE
+
+        if not use_table and not self.can_search:
+            messagebox.showinfo(
+                "AI Solve",
+                f"Bidirectional BFS cannot solve {self.board.rows}x{self.board.cols} boards "
+                f"({self.board.num_states:,} states).",
+            )
+            return
+
+        if use_table and not dp.dp_table:
+            messagebox.showinfo("AI Solve", "The DP table is not ready yet.")
+            return
+
         self.ai_solving = True
         self.round_active = False
         self.status_lbl.config(text="Status: AI solving...")
         self.update_boards()
 
-        start = tuple(x for row in self.ai_state for x in row)
-        path = reconstruct_path(start)
+        # Moves are drawn from the solver's generator one frame at a time:
+        # the table walk finds each step as it is shown.
+        events = iter_path(start) if use_table else iter_bidirectional(start, self.board)
+        self.animate(stream.moves(events), 0)
 
-        if not path:
+    def animate(self, moves, i):
+        state = next(moves, None)
+        if state is None and i == 0:
             self.ai_solving = False
             self.status_lbl.config(text="Status: No solution from current state")
             messagebox.showinfo("AI Solver", "No solution exists!")
             return
 
-        self.animate(path, 0)
-
-    def animate(self, path, i):
-        if i < len(path):
-            flat = path[i]
-            self.ai_state = [list(flat[0:3]), list(flat[3:6]), list(flat[6:9])]
+        if state is not None:
+            self.ai_state = self.board.to_grid(self.board.pack(state))
             self.ai_steps = i
 
             self.update_boards()
-            self.root.after(300, lambda: self.animate(path, i + 1))
+            self.root.after(300, lambda: self.animate(moves, i + 1))
             return
 
         self.ai_finished = True
@@ -328,6 +415,9 @@ class PuzzleApp:
 # ------------------ RUN ------------------
 
 if __name__ == "__main__":
+    # optional board size: python dynamicprogram.py ROWS COLS
+    rows, cols = map(int, sys.argv[1:3]) if len(sys.argv) > 2 else (3, 3)
+    load_gui()
     root = tk.Tk()
-    PuzzleApp(root)
+    PuzzleApp(root, rows, cols)
     root.mainloop()
\ No newline at end of file
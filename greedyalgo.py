@@ -1,151 +1,43 @@
-import tkinter as tk
-from tkinter import messagebox
-from PIL import Image, ImageTk
-from copy import deepcopy
 import random
 import os
+import sys
+from copy import deepcopy
 
-# ------------------ CONSTANTS ------------------
-
-TILE = 160
-BOARD_SIZE = 480
-BG_COLOR = "misty rose"
-
-GOAL = [[1, 2, 3],
-        [4, 5, 6],
-        [7, 8, 0]]
-
-DIRS = [(-1, 0), (1, 0), (0, -1), (0, 1)]
-
-# ------------------ ADJACENCY MATRIX GRAPH ------------------
-
-state_index = {}     # state -> index
-index_state = {}     # index -> state
-adj_matrix = []      # adjacency matrix
-
-def add_state(state):
-    key = str(state)
-    if key not in state_index:
-        idx = len(state_index)
-        state_index[key] = idx
-        index_state[idx] = deepcopy(state)
-
-        for row in adj_matrix:
-            row.append(0)
-        adj_matrix.append([0] * (idx + 1))
-
-    return state_index[key]
-
-def add_edge(s1, s2):
-    i = add_state(s1)
-    j = add_state(s2)
-    adj_matrix[i][j] = 1
-    adj_matrix[j][i] = 1   # undirected graph
-
-# ------------------ UTILITY FUNCTIONS ------------------
-
-def find_zero(state):
-    for r in range(3):
-        for c in range(3):
-            if state[r][c] == 0:
-                return r, c
-
-def manhattan(state):
-    d = 0
-    for r in range(3):
-        for c in range(3):
-            v = state[r][c]
-            if v != 0:
-                tr, tc = divmod(v - 1, 3)
-                d += abs(r - tr) + abs(c - tc)
-    return d
-
-def linear_conflict(state):
-    md = manhattan(state)
-    conflicts = 0
-
-    for r in range(3):
-        row = [state[r][c] for c in range(3) if state[r][c] != 0]
-        for i in range(len(row)):
-            for j in range(i + 1, len(row)):
-                tr_i, _ = divmod(row[i] - 1, 3)
-                tr_j, _ = divmod(row[j] - 1, 3)
-                if tr_i == r and tr_j == r and row[i] > row[j]:
-                    conflicts += 1
-
-    return md + 2 * conflicts
-
-# ------------------ MERGE SORT ------------------
-
-def merge_sort(arr):
-    if len(arr) <= 1:
-        return arr
-
-    mid = len(arr) // 2
-    left = merge_sort(arr[:mid])
-    right = merge_sort(arr[mid:])
-
-    return merge(left, right)
-
-def merge(left, right):
-    result = []
-    i = j = 0
-
-    while i < len(left) and j < len(right):
-        if left[i][0] < right[j][0]:
-            result.append(left[i])
-            i += 1
-        else:
-            result.append(right[j])
-            j += 1
-
-    result.extend(left[i:])
-    result.extend(right[j:])
-    return result
-
-# ------------------ GREEDY SOLVER (WITH ADJ MATRIX) ------------------
-
-def greedy_solver(start):
-    open_list = [(linear_conflict(start), start, [])]
-    visited = set()
-
-    add_state(start)
-
-    while open_list:
-        open_list = merge_sort(open_list)
-        _, state, path = open_list.pop(0)
-
-        if state == GOAL:
-            return path + [state]
+from puzzle import state as ps
+from puzzle import stream
+from puzzle.greedy import DIRS, find_zero, iter_greedy
 
-        visited.add(str(state))
-        zr, zc = find_zero(state)
+# tkinter and PIL are imported by load_gui() when the window starts, so the
+# solver above can be imported on machines without a display stack.
+tk = messagebox = Image = ImageTk = None
 
-        for dr, dc in DIRS:
-            nr, nc = zr + dr, zc + dc
-            if 0 <= nr < 3 and 0 <= nc < 3:
-                nxt = deepcopy(state)
-                nxt[zr][zc], nxt[nr][nc] = nxt[nr][nc], 0
+def load_gui():
+    global tk, messagebox, Image, ImageTk
+    import tkinter as tk
+    from tkinter import messagebox
+    from PIL import Image, ImageTk
 
-                add_edge(state, nxt)   
-
-                if str(nxt) not in visited:
-                    h = linear_conflict(nxt)
-                    open_list.append((h, nxt, path + [state]))
+# ------------------ CONSTANTS ------------------
 
-    return []
+BOARD_SIZE = 480
+BG_COLOR = "misty rose"
 
 # ------------------ GUI APPLICATION ------------------
 
 class PuzzleApp:
-    def __init__(self, root):
+    def __init__(self, root, rows=3, cols=3):
+        load_gui()
         self.root = root
-        root.title("8-Puzzle — User vs Greedy AI (Adjacency Matrix)")
+        self.board = ps.get_board(rows, cols)
+        self.goal = self.board.to_grid(self.board.goal)
+        self.title = (f"{self.board.size - 1}-Puzzle — "
+                      "User vs Greedy AI (Adjacency Table)")
+        root.title(self.title)
         root.geometry("1500x800")
         root.configure(bg=BG_COLOR)
 
-        self.user_state = deepcopy(GOAL)
-        self.ai_state = deepcopy(GOAL)
+        self.user_state = deepcopy(self.goal)
+        self.ai_state = deepcopy(self.goal)
 
         self.user_steps = 0
         self.ai_steps = 0
@@ -163,7 +55,7 @@ class PuzzleApp:
         bar.pack(fill="x")
 
         tk.Label(bar,
-                 text="8-Puzzle — User vs Greedy AI (Adjacency Matrix)",
+                 text=self.title,
                  bg="Dark slate grey",
                  fg="white",
                  font=("Segoe UI", 22, "bold")).pack(pady=10)
@@ -226,8 +118,8 @@ class PuzzleApp:
         board.pack_propagate(False)
 
         tiles = []
-        for r in range(3):
-            for c in range(3):
+        for r in range(self.board.rows):
+            for c in range(self.board.cols):
                 b = tk.Button(board, bd=0, bg="black",
                               activebackground="black",
                               command=(lambda r=r, c=c: command(r, c))
@@ -238,11 +130,13 @@ class PuzzleApp:
 
     def load_image(self):
         img = Image.open(self.image_name).resize((BOARD_SIZE, BOARD_SIZE))
+        tw = BOARD_SIZE // self.board.cols
+        th = BOARD_SIZE // self.board.rows
         self.cuts = []
-        for i in range(8):
-            r, c = divmod(i, 3)
-            piece = img.crop((c * TILE, r * TILE,
-                              (c + 1) * TILE, (r + 1) * TILE))
+        for i in range(self.board.size - 1):
+            r, c = divmod(i, self.board.cols)
+            piece = img.crop((c * tw, r * th,
+                              (c + 1) * tw, (r + 1) * th))
             self.cuts.append(ImageTk.PhotoImage(piece))
         self.cuts.append(None)
 
@@ -258,8 +152,8 @@ class PuzzleApp:
             text=f"User Steps: {self.user_steps} | AI Steps: {self.ai_steps}")
 
     def update_board(self, tiles, state):
-        for i in range(9):
-            r, c = divmod(i, 3)
+        for i in range(self.board.size):
+            r, c = divmod(i, self.board.cols)
             v = state[r][c]
             tiles[i].config(image="" if v == 0 else self.cuts[v - 1])
 
@@ -271,18 +165,18 @@ class PuzzleApp:
             self.user_steps += 1
             self.update_boards()
 
-            if self.user_state == GOAL:
+            if self.user_state == self.goal:
                 messagebox.showinfo(
                     "User Solved",
                     f"You solved it in {self.user_steps} steps!")
 
     def shuffle(self):
-        state = deepcopy(GOAL)
+        state = deepcopy(self.goal)
         for _ in range(150):
             zr, zc = find_zero(state)
             dr, dc = random.choice(DIRS)
             nr, nc = zr + dr, zc + dc
-            if 0 <= nr < 3 and 0 <= nc < 3:
+            if 0 <= nr < self.board.rows and 0 <= nc < self.board.cols:
                 state[zr][zc], state[nr][nc] = state[nr][nc], 0
 
         self.user_state = deepcopy(state)
@@ -292,21 +186,29 @@ class PuzzleApp:
         self.update_boards()
 
     def solve_ai(self):
+        if not self.board.is_solvable(self.board.from_grid(self.ai_state)):
+            messagebox.showinfo("Greedy AI", "This board cannot be solved.")
+            return
         self.ai_steps = 0
-        path = greedy_solver(deepcopy(self.ai_state))
-        self.animate_ai(path, 0)
+        moves = stream.moves(iter_greedy(deepcopy(self.ai_state), board=self.board))
+        self.animate_ai(moves, 0)
 
-    def animate_ai(self, path, i):
-        if i < len(path):
+    def animate_ai(self, moves, i):
+        # moves come straight from the solver's generator, one per frame
+        state = next(moves, None)
+        if state is not None:
             if i > 0:
                 self.ai_steps += 1
-            self.ai_state = deepcopy(path[i])
+            self.ai_state = self.board.to_grid(self.board.pack(state))
             self.update_boards()
-            self.root.after(400, lambda: self.animate_ai(path, i + 1))
+            self.root.after(400, lambda: self.animate_ai(moves, i + 1))
 
 # ------------------ MAIN ------------------
 
 if __name__ == "__main__":
+    # optional board size: python greedyalgo.py ROWS COLS
+    rows, cols = map(int, sys.argv[1:3]) if len(sys.argv) > 2 else (3, 3)
+    load_gui()
     root = tk.Tk()
-    PuzzleApp(root)
+    PuzzleApp(root, rows, cols)
     root.mainloop()
\ No newline at end of file
@@ -0,0 +1,5 @@
+"""Headless 8-puzzle solvers and the building blocks they share.
+
+The solver cores (greedy, dp, dnc, backtrack) import no GUI toolkit; the
+Tkinter front ends are the scripts next to this package.
+"""
@@ -0,0 +1,317 @@
+"""Backtracking and IDA* solvers (see backtracking.py)."""
+
+from puzzle import metrics
+from puzzle import state as ps
+from puzzle import patterndb
+from puzzle import stream
+from puzzle.heuristics import delta_for
+
+def generate_neighbors(state, board=ps.DEFAULT):
+    """Generate all valid neighboring states from current state"""
+    blank_pos = state.index(0)
+    neighbors = []
+    
+    for new_blank_pos in backtrack_moves(board)[blank_pos]:
+        new_state = list(state)
+        new_state[blank_pos], new_state[new_blank_pos] = \
+            new_state[new_blank_pos], new_state[blank_pos]
+        neighbors.append(tuple(new_state))
+    
+    return neighbors
+    
+# Blank moves in generate_neighbors order: left, right, up, down
+BACKTRACK_ORDER = [(0, -1), (0, 1), (-1, 0), (1, 0)]
+BACKTRACK_MOVES = ps.moves_for(BACKTRACK_ORDER)
+
+def backtrack_moves(board):
+    if board is ps.DEFAULT:
+        return BACKTRACK_MOVES
+    return board.moves_for(BACKTRACK_ORDER)
+
+def pure_backtrack_simple(current, goal, visited, path, explored_states, depth=0, max_depth=100,
+                          board=ps.DEFAULT):
+    """
+    Pure Simple Backtracking Algorithm
+    Now also tracks ALL explored states in order
+
+    Runs BacktrackSearch to completion: same visiting order as the
+    recursive formulation, but on an explicit stack, so the depth is not
+    limited by the interpreter's recursion limit. `visited` is filled
+    with packed states (see puzzle.state); the returned path holds flat
+    tuples. `explored_states` receives every explored state as a flat
+    tuple: a list, a bounded sink from puzzle.trace, or None for no trace.
+    Boards larger than 3x3 raise ValueError: the visited set would have to
+    hold an unbounded part of their state space.
+    """
+    run = metrics.start("backtracking")
+    search = BacktrackSearch(current, goal, visited, path, explored_states,
+                             depth, max_depth, board)
+    search.run()
+    _finish_run(run, search)
+    return search.result
+
+# Expansions between two batches of iter_backtrack events
+STREAM_CHUNK = 1024
+
+def iter_backtrack(current, goal, visited, path, depth=0, max_depth=100, board=ps.DEFAULT,
+                   explore=False):
+    """
+    Generator mode of pure_backtrack_simple (see puzzle.stream)
+    The search runs STREAM_CHUNK expansions at a time and the explored
+    states of each slice are yielded before the next one starts, so
+    stopping the generator stops the search. The solution is only known
+    once the search reaches the goal.
+    """
+    run = metrics.start("backtracking")
+    explored = [] if explore else None
+    search = BacktrackSearch(current, goal, visited, path, explored,
+                             depth, max_depth, board)
+    finished = False
+    while not finished:
+        finished = search.run(STREAM_CHUNK)
+        if explore:
+            for state in explored:
+                yield stream.EXPLORE, state
+            explored.clear()
+    _finish_run(run, search)
+    for state in search.result or ():
+        yield stream.MOVE, state
+
+def _finish_run(run, search):
+    if run is not None:
+        run.expanded = search.expanded
+        run.generated = max(search.expanded - 1, 0) + search.pruned
+        run.duplicates = search.pruned
+        run.frontier_max = search.deepest
+        run.finish()
+
+class BacktrackSearch:
+    """
+    Resumable explicit-stack backtracking search
+    run(n) explores at most n more states and returns True once the
+    search has finished; `result` then holds the path (or None). Each
+    stack frame is a state, its blank cell and the index of the next
+    move to try, kept in three parallel lists. `pruned` counts neighbours
+    skipped as already visited and `deepest` the largest stack size.
+    Refuses boards larger than 3x3 (see puzzle.state.check_exhaustive).
+    """
+    
+    def __init__(self, current, goal, visited, path, explored_states, depth=0, max_depth=100,
+                 board=ps.DEFAULT):
+        ps.check_exhaustive(board, "plain backtracking")
+        self.board = board
+        self.moves = backtrack_moves(board)
+        self.goal = board.pack(goal)
+        self.visited = visited
+        self.prefix = [board.pack(s) for s in path]
+        self.explored_states = explored_states
+        self.base_depth = depth
+        self.max_depth = max_depth
+        
+        self.codes = []
+        self.blanks = []
+        self.next_move = []
+        
+        self.done = False
+        self.result = None
+        self.expanded = 0
+        self.pruned = 0
+        self.deepest = 0
+        
+        code = board.pack(current)
+        self.pending = (code, board.blank_index(code))
+        if not board.is_solvable(code, self.goal):
+            # Different parity classes: finish at once with no path
+            self.pending = None
+            self.done = True
+    
+    def enter(self, code, blank):
+        # Record this state as explored
+        if self.explored_states is not None:
+            self.explored_states.append(self.board.unpack(code))
+        self.expanded += 1
+        
+        # Base case: goal found
+        if code == self.goal:
+            self.done = True
+            self.result = [self.board.unpack(s) for s in self.prefix + self.codes + [code]]
+            return
+        
+        # Depth limit: explored but not expanded
+        if self.base_depth + len(self.codes) > self.max_depth:
+            return
+        
+        self.visited.add(code)
+        self.codes.append(code)
+        self.blanks.append(blank)
+        self.next_move.append(0)
+        if len(self.codes) > self.deepest:
+            self.deepest = len(self.codes)
+    
+    def run(self, max_expansions=None):
+        if self.pending is not None:
+            code, blank = self.pending
+            self.pending = None
+            self.enter(code, blank)
+        
+        limit = None if max_expansions is None else self.expanded + max_expansions
+        codes, blanks, next_move = self.codes, self.blanks, self.next_move
+        visited = self.visited
+        all_moves, move_blank = self.moves, self.board.move_blank
+        pruned = 0
+        
+        while codes and not self.done:
+            if limit is not None and self.expanded >= limit:
+                self.pruned += pruned
+                return False
+            
+            top = len(codes) - 1
+            blank = blanks[top]
+            moves = all_moves[blank]
+            i = next_move[top]
+            
+            if i == len(moves):
+                # Backtrack
+                codes.pop()
+                blanks.pop()
+                next_move.pop()
+                continue
+            
+            next_move[top] = i + 1
+            target = moves[i]
+            neighbor = move_blank(codes[top], blank, target)
+            if neighbor not in visited:
+                self.enter(neighbor, target)
+            else:
+                pruned += 1
+        
+        self.pruned += pruned
+        self.done = True
+        return True
+
+UNBOUNDED = float("inf")
+
+def ida_star(start, explored_states=None, h=None, board=ps.DEFAULT):
+    """
+    Iterative-Deepening A* Backtracking
+    Depth-first search bounded by f = g + h, where h is an admissible
+    heuristic over packed states (by default the additive pattern
+    database that divide&conquer.py also uses); the bound grows to the
+    smallest f that overflowed until the goal is reached. Moves are applied to a single
+    path stack and undone on return, and the move that would undo the
+    previous one is never tried, so memory is O(depth) and the returned
+    path is optimal. Expanded states are appended to explored_states.
+    """
+    events = iter_ida(start, h, board, explored_states is not None)
+    return stream.collect(events, explored_states) or None
+
+def iter_ida(start, h=None, board=ps.DEFAULT, explore=False, cancel=None):
+    """
+    Generator mode of ida_star (see puzzle.stream)
+    The search runs on an explicit stack, like BacktrackSearch, so every
+    explored state is yielded as soon as it is expanded and closing the
+    generator stops the search mid-iteration. Each stack frame is a
+    state, its blank cell, the blank cell it came from, its heuristic
+    value, the index of the next move to try and the smallest f that
+    overflowed the bound below it, kept in parallel lists. The search
+    stops without a path once cancel.is_set().
+    """
+    code = board.pack(start)
+    if not board.is_solvable(code):
+        return      # unreachable from the goal
+    
+    if h is None:
+        h = patterndb.default(board)
+    all_moves, move_blank, unpack = backtrack_moves(board), board.move_blank, board.unpack
+    update = delta_for(h)
+    goal = board.goal
+    
+    run = metrics.start("ida")
+    generated = pushed = 0
+    
+    def done():
+        # every generated child had its heuristic evaluated, and the start
+        if run is not None:
+            run.generated += generated
+            run.finish(pushed, generated + 1)
+    
+    start_h = h(code)
+    bound = start_h
+    while True:
+        codes = [code]
+        blanks = [board.blank_index(code)]
+        prev_blanks = [-1]
+        estimates = [start_h]
+        next_move = [0]
+        minima = [UNBOUNDED]
+        if explore:
+            yield stream.EXPLORE, unpack(code)
+        if run is not None:
+            run.expand(1, 0)
+        if code == goal:
+            break
+        
+        found = False
+        while codes:
+            if cancel is not None and cancel.is_set():
+                done()
+                return
+            top = len(codes) - 1
+            blank = blanks[top]
+            moves = all_moves[blank]
+            i = next_move[top]
+            
+            if i == len(moves):
+                # Backtrack, passing the smallest overflow up
+                t = minima.pop()
+                codes.pop()
+                blanks.pop()
+                prev_blanks.pop()
+                estimates.pop()
+                next_move.pop()
+                if codes and t < minima[-1]:
+                    minima[-1] = t
+                continue
+            
+            next_move[top] = i + 1
+            target = moves[i]
+            if target == prev_blanks[top]:
+                continue
+            current = codes[top]
+            child = move_blank(current, blank, target)
+            generated += 1
+            if update is not None:
+                child_h = update(estimates[top], current, blank, target)
+            else:
+                child_h = h(child)
+            f = top + 1 + child_h
+            if f > bound:
+                if f < minima[top]:
+                    minima[top] = f
+                continue
+            
+            codes.append(child)
+            blanks.append(target)
+            prev_blanks.append(blank)
+            estimates.append(child_h)
+            next_move.append(0)
+            minima.append(UNBOUNDED)
+            pushed += 1
+            if explore:
+                yield stream.EXPLORE, unpack(child)
+            if run is not None:
+                run.expand(top + 2, 0)
+            if child == goal:
+                found = True
+                break
+        
+        if found:
+            break
+        if t == UNBOUNDED:
+            done()
+            return
+        bound = t
+    
+    done()
+    for c in codes:
+        yield stream.MOVE, unpack(c)
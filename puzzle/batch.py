@@ -0,0 +1,201 @@
+"""Headless batch solving over a process pool.
+
+:func:`solve_batch` takes any iterable of boards (flat tile sequences),
+solves them with one of the four engines and yields the solutions in
+input order::
+
+    for path in solve_batch(boards, engine="dp", workers=8):
+        ...
+
+A solution is a list of flat tuples from the start board to the goal, or
+None when the board cannot be solved. Boards are sent to the workers in
+chunks and at most a few chunks per worker are in flight, so arbitrarily
+long streams run in bounded memory.
+
+Each worker imports the engine module and loads its heavy tables -- the
+DP distance table or the pattern databases -- once, in the pool
+initializer; the parent builds missing table files first so the workers
+only memory-map them. No GUI module is imported.
+
+Run as ``python -m puzzle.batch [--engine E] [boards.txt]`` to solve one
+board per line (tiles separated by spaces or commas) and print the number
+of moves for each, -1 for unsolvable boards, then the solution cache's
+hit/miss statistics on stderr.
+"""
+
+import argparse
+import importlib
+import os
+import sys
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+from puzzle import cache as solution_cache
+from puzzle import patterndb
+from puzzle import state as ps
+from puzzle import stream
+
+# engine name -> solver module; the names match puzzle.bench, where
+# "backtracking" is the plain depth-first search that is not offered here
+ENGINES = {
+    "greedy": "puzzle.greedy",
+    "dp": "puzzle.dp",
+    "dnc": "puzzle.dnc",
+    "ida": "puzzle.backtrack",
+}
+
+CHUNK_SIZE = 64
+CHUNKS_PER_WORKER = 4
+
+
+def load_engine(engine):
+    """The solver module behind ``engine``."""
+    try:
+        return importlib.import_module(ENGINES[engine])
+    except KeyError:
+        raise ValueError(f"unknown engine {engine!r}; choose from {', '.join(ENGINES)}") from None
+
+
+def prepare(engine, board=ps.DEFAULT):
+    """Load ``engine`` and the tables it needs, building missing table files."""
+    module = load_engine(engine)
+    if engine == "dp":
+        module.check_table_board(board)
+        module.build_dp_table()
+    else:
+        patterndb.default(board)
+    return module
+
+
+def iter_solve(engine, tiles, board=ps.DEFAULT, explore=False, cancel=None):
+    """The event generator of ``engine`` for one board (see :mod:`puzzle.stream`)."""
+    module = load_engine(engine)
+    tiles = tuple(tiles)
+    if engine == "greedy":
+        module.reset_graph(board)   # the adjacency graph would otherwise grow per board
+        return module.iter_greedy(board.to_grid(board.pack(tiles)), board=board, explore=explore,
+                                  cancel=cancel)
+    if engine == "dp":
+        return module.iter_path(tiles, board, explore, cancel)
+    if engine == "dnc":
+        return module.iter_dnc(tiles, board, explore, cancel)
+    return module.iter_ida(tiles, board=board, explore=explore, cancel=cancel)
+
+
+def solve_one(engine, tiles, board=ps.DEFAULT, cache=None):
+    """Solve one board with ``engine``; a list of flat tuples, or None.
+
+    A :class:`~puzzle.cache.SolutionCache` passed as ``cache`` is consulted
+    first and given every new solution.
+    """
+    if cache is not None:
+        path = cache.get(engine, tiles, board)
+        if path is not None:
+            return path
+    path = stream.collect(iter_solve(engine, tiles, board))
+    if cache is not None:
+        cache.put(engine, path, board)
+    return path or None
+
+
+# ------------------ WORKERS ------------------
+
+_worker = None      # (engine, board, cache) of this worker process
+
+
+def _new_cache(cache_size):
+    return solution_cache.SolutionCache(cache_size) if cache_size else None
+
+
+def _init_worker(engine, rows, cols, cache_size=solution_cache.MAXSIZE):
+    global _worker
+    board = ps.get_board(rows, cols)
+    prepare(engine, board)
+    _worker = (engine, board, _new_cache(cache_size))
+
+
+def _solve_chunk(chunk):
+    # the solutions, with this worker's pid and cache statistics
+    engine, board, cache = _worker
+    paths = [solve_one(engine, tiles, board, cache) for tiles in chunk]
+    return paths, os.getpid(), cache.stats() if cache is not None else None
+
+
+def solve_batch(boards, engine="dp", workers=None, rows=3, cols=3, chunk_size=CHUNK_SIZE,
+                cache_size=solution_cache.MAXSIZE, stats=None):
+    """Yield the solution of every board in ``boards``, in input order.
+
+    ``workers`` defaults to the CPU count; ``workers=1`` solves in this
+    process without a pool. Each process keeps its own solution cache of
+    ``cache_size`` boards; 0 disables it. A dict passed as ``stats`` is
+    kept up to date with the caches' combined statistics (see
+    :func:`puzzle.cache.combine`).
+    """
+    board = ps.get_board(rows, cols)
+    prepare(engine, board)
+    boards = iter(boards)
+
+    if workers == 1:
+        cache = _new_cache(cache_size)
+        for tiles in boards:
+            path = solve_one(engine, tiles, board, cache)
+            if stats is not None and cache is not None:
+                stats.update(cache.stats())
+            yield path
+        return
+
+    workers = workers or os.cpu_count() or 1
+    with ProcessPoolExecutor(workers, initializer=_init_worker,
+                             initargs=(engine, rows, cols, cache_size)) as pool:
+        pending = deque()
+        per_worker = {}     # pid -> latest cache statistics
+        while True:
+            while len(pending) < workers * CHUNKS_PER_WORKER:
+                chunk = list(islice(boards, chunk_size))
+                if not chunk:
+                    break
+                pending.append(pool.submit(_solve_chunk, chunk))
+            if not pending:
+                return
+            paths, pid, cache_stats = pending.popleft().result()
+            if stats is not None and cache_stats is not None:
+                per_worker[pid] = cache_stats
+                stats.update(solution_cache.combine(per_worker.values()))
+            yield from paths
+
+
+# ------------------ COMMAND LINE ------------------
+
+def read_boards(lines):
+    for line in lines:
+        line = line.replace(",", " ").split()
+        if line:
+            yield tuple(int(v) for v in line)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Solve a file of puzzle boards.")
+    parser.add_argument("boards", nargs="?", type=argparse.FileType("r"), default=sys.stdin,
+                        help="one board per line (default: stdin)")
+    parser.add_argument("--engine", choices=ENGINES, default="dp")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--rows", type=int, default=3)
+    parser.add_argument("--cols", type=int, default=3)
+    parser.add_argument("--cache-size", type=int, default=solution_cache.MAXSIZE,
+                        help="solutions cached per process (0: no cache)")
+    args = parser.parse_args(argv)
+
+    stats = {}
+    results = solve_batch(read_boards(args.boards), args.engine, args.workers,
+                          args.rows, args.cols, cache_size=args.cache_size, stats=stats)
+    for path in results:
+        print(len(path) - 1 if path else -1)
+    if stats:
+        print(f"cache: {stats['hits']} hits, {stats['misses']} misses "
+              f"({stats['hit_rate']:.1%} hit rate), {stats['evictions']} evictions",
+              file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,270 @@
+"""Reproducible benchmarks of the solvers on fixed instance sets.
+
+Instance sets are seeded random scrambles at several depths plus the two
+hardest 3x3 boards (31 moves, the diameter of the state space). Every
+engine solves every instance twice:
+
+* a timing run, the best of ``repeat`` wall-clock times with nothing
+  recorded, and
+* a measuring run under ``tracemalloc`` that counts expanded nodes through
+  the engine's ``explored_states`` argument and records peak memory.
+
+Results are written as JSON. Comparing against an earlier file flags
+(engine, set) pairs that got slower than the tolerance, or that now
+expand more nodes or return longer solutions::
+
+    python -m puzzle.bench -o before.json
+    ... change something ...
+    python -m puzzle.bench -o after.json --baseline before.json
+"""
+
+import argparse
+import json
+import platform
+import random
+import statistics
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+from puzzle import backtrack, dnc, dp, greedy, patterndb
+from puzzle import state as ps
+from puzzle.trace import CountTrace
+
+RESULTS_VERSION = 1
+
+DEPTHS = (8, 16, 24, 40)
+COUNT = 20
+SEED = 2024
+REPEAT = 3
+TOLERANCE = 0.25
+# Slowdowns smaller than this (per set, in seconds) are timer noise.
+MIN_SLOWDOWN = 0.005
+
+# The only two 3x3 boards 31 moves from the goal.
+HARDEST = ((8, 6, 7, 2, 5, 4, 3, 0, 1),
+           (6, 4, 7, 8, 5, 0, 3, 2, 1))
+
+
+# ------------------ INSTANCES ------------------
+
+def scramble(rng, depth, board=ps.DEFAULT):
+    """A board ``depth`` random slides from the goal, never undoing the last one."""
+    code = board.goal
+    blank = board.blank_index(code)
+    prev = -1
+    for _ in range(depth):
+        target = rng.choice([t for t in board.moves[blank] if t != prev])
+        code = board.move_blank(code, blank, target)
+        prev, blank = blank, target
+    return board.unpack(code)
+
+
+def instance_sets(depths=DEPTHS, count=COUNT, seed=SEED):
+    """``{set name: [boards]}``, identical for identical arguments."""
+    sets = {}
+    for depth in depths:
+        rng = random.Random(f"{seed}:{depth}")
+        sets[f"scramble-{depth}"] = [scramble(rng, depth) for _ in range(count)]
+    sets["hardest-31"] = list(HARDEST)
+    return sets
+
+
+# ------------------ ENGINES ------------------
+
+def _greedy(tiles, explored):
+    greedy.reset_graph()
+    return greedy.greedy_solver(ps.to_grid(ps.pack(tiles)), explored_states=explored)
+
+
+def _dp(tiles, explored):
+    return dp.reconstruct_path(tiles, explored_states=explored)
+
+
+def _dnc(tiles, explored):
+    return dnc.dnc_solver(tiles, explored_states=explored)
+
+
+def _backtracking(tiles, explored):
+    return backtrack.pure_backtrack_simple(tiles, ps.GOAL_TILES, set(), [], explored)
+
+
+def _ida(tiles, explored):
+    return backtrack.ida_star(tiles, explored)
+
+
+# engine name -> solve(tiles, explored_states) returning a path; the
+# names are shared with puzzle.batch and the solve service, and
+# "backtracking" is the plain depth-first search, "ida" is IDA*
+ENGINES = {
+    "greedy": _greedy,
+    "dp": _dp,
+    "dnc": _dnc,
+    "backtracking": _backtracking,
+    "ida": _ida,
+}
+
+
+# ------------------ RUNNING ------------------
+
+def _timed(fn):
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+
+def setup():
+    """Load (or build) the shared tables; seconds spent on each."""
+    return {
+        "dp_table": _timed(dp.build_dp_table),
+        "pattern_db": _timed(patterndb.default),
+    }
+
+
+def measure(engine, tiles, repeat=REPEAT):
+    solve = ENGINES[engine]
+    seconds = min(_timed(lambda: solve(tiles, None)) for _ in range(repeat))
+
+    counter = CountTrace()
+    tracemalloc.start()
+    try:
+        path = solve(tiles, counter)
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "engine": engine,
+        "board": list(tiles),
+        "seconds": seconds,
+        "nodes": counter.total,
+        "peak_bytes": peak,
+        "length": len(path) - 1 if path else None,
+    }
+
+
+def summarize(results):
+    groups = {}
+    for r in results:
+        groups.setdefault((r["engine"], r["set"]), []).append(r)
+
+    summary = []
+    for (engine, name), rows in groups.items():
+        lengths = [r["length"] for r in rows if r["length"] is not None]
+        summary.append({
+            "engine": engine,
+            "set": name,
+            "instances": len(rows),
+            "solved": len(lengths),
+            "total_seconds": sum(r["seconds"] for r in rows),
+            "median_seconds": statistics.median(r["seconds"] for r in rows),
+            "mean_nodes": statistics.fmean(r["nodes"] for r in rows),
+            "max_peak_bytes": max(r["peak_bytes"] for r in rows),
+            "mean_length": statistics.fmean(lengths) if lengths else None,
+        })
+    return summary
+
+
+def run(engines=None, depths=DEPTHS, count=COUNT, seed=SEED, repeat=REPEAT, progress=None):
+    """Benchmark ``engines`` (all by default) and return the results document."""
+    engines = list(engines or ENGINES)
+    for engine in engines:
+        if engine not in ENGINES:
+            raise ValueError(f"unknown engine {engine!r}; choose from {', '.join(ENGINES)}")
+
+    setup_seconds = setup()
+    results = []
+    for name, boards in instance_sets(depths, count, seed).items():
+        for engine in engines:
+            if progress is not None:
+                progress(engine, name)
+            for tiles in boards:
+                row = measure(engine, tiles, repeat)
+                row["set"] = name
+                results.append(row)
+
+    return {
+        "version": RESULTS_VERSION,
+        "meta": {
+            "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "depths": list(depths),
+            "count": count,
+            "seed": seed,
+            "repeat": repeat,
+        },
+        "setup_seconds": setup_seconds,
+        "summary": summarize(results),
+        "results": results,
+    }
+
+
+# ------------------ COMPARING ------------------
+
+def compare(baseline, current, tolerance=TOLERANCE):
+    """Lines describing regressions of ``current`` against ``baseline``."""
+    before = {(s["engine"], s["set"]): s for s in baseline["summary"]}
+    problems = []
+    for s in current["summary"]:
+        old = before.get((s["engine"], s["set"]))
+        if old is None:
+            continue
+        label = f"{s['engine']} / {s['set']}"
+        if (old["total_seconds"] and s["total_seconds"] > old["total_seconds"] * (1 + tolerance)
+                and s["total_seconds"] - old["total_seconds"] > MIN_SLOWDOWN):
+            problems.append(f"{label}: {s['total_seconds'] / old['total_seconds']:.2f}x slower")
+        if s["mean_nodes"] > old["mean_nodes"]:
+            problems.append(f"{label}: mean nodes {old['mean_nodes']:.1f} -> {s['mean_nodes']:.1f}")
+        if s["solved"] < old["solved"]:
+            problems.append(f"{label}: solved {old['solved']} -> {s['solved']}")
+        if (s["mean_length"] is not None and old["mean_length"] is not None
+                and s["mean_length"] > old["mean_length"]):
+            problems.append(f"{label}: mean length {old['mean_length']:.2f} -> {s['mean_length']:.2f}")
+    return problems
+
+
+def format_summary(summary):
+    lines = [f"{'engine':<13}{'set':<14}{'solved':>7}{'median ms':>11}{'nodes':>10}"
+             f"{'peak KiB':>10}{'length':>8}"]
+    for s in summary:
+        length = "-" if s["mean_length"] is None else f"{s['mean_length']:.1f}"
+        lines.append(f"{s['engine']:<13}{s['set']:<14}{s['solved']:>4}/{s['instances']:<2}"
+                     f"{s['median_seconds'] * 1000:>11.2f}{s['mean_nodes']:>10.0f}"
+                     f"{s['max_peak_bytes'] / 1024:>10.0f}{length:>8}")
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the puzzle solvers.")
+    parser.add_argument("-o", "--output", help="write the JSON results here")
+    parser.add_argument("--engines", nargs="+", choices=ENGINES, default=list(ENGINES))
+    parser.add_argument("--depths", nargs="+", type=int, default=list(DEPTHS))
+    parser.add_argument("--count", type=int, default=COUNT, help="boards per scramble depth")
+    parser.add_argument("--seed", type=int, default=SEED)
+    parser.add_argument("--repeat", type=int, default=REPEAT, help="timing runs per board")
+    parser.add_argument("--baseline", help="earlier JSON results to compare against")
+    parser.add_argument("--tolerance", type=float, default=TOLERANCE,
+                        help="allowed slowdown before a time regression is reported")
+    args = parser.parse_args(argv)
+
+    doc = run(args.engines, args.depths, args.count, args.seed, args.repeat,
+              progress=lambda engine, name: print(f"{engine} on {name}...", file=sys.stderr))
+    print(format_summary(doc["summary"]))
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(doc, f, indent=1)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            problems = compare(json.load(f), doc, args.tolerance)
+        for line in problems:
+            print("REGRESSION", line)
+        return 1 if problems else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,110 @@
+"""Bounded LRU cache of solutions, keyed by engine and packed board.
+
+Shuffles from the GUIs (40 random moves in divide&conquer.py, 10-20 in
+backtracking.py) stay close to the goal, so the same boards come back
+often. :class:`SolutionCache` keeps the solutions of the most recently
+used ``maxsize`` boards per process::
+
+    cache = SolutionCache()
+    path = cache.get("dnc", tiles)
+    if path is None:
+        path = dnc.dnc_solver(tiles)
+        cache.put("dnc", path)
+    cache.stats()   # {"hits": ..., "misses": ..., "hit_rate": ..., ...}
+
+Paths of the engines in :data:`OPTIMAL` are shortest paths, and so is
+every suffix of one: :meth:`SolutionCache.put` adds an entry for each
+state along such a path. The suffix entries share the path's storage. The
+other engines are only cached for the board they were asked to solve,
+because a suffix of a greedy or divide-and-conquer path is not what the
+engine would return from that board.
+"""
+
+from collections import OrderedDict
+
+from puzzle import state as ps
+
+MAXSIZE = 4096
+
+# engines (see puzzle.batch.ENGINES) whose paths are shortest paths
+OPTIMAL = frozenset({"dp", "ida"})
+
+# the counts in SolutionCache.stats(); hit_rate is derived from them
+COUNTS = ("size", "maxsize", "hits", "misses", "evictions")
+
+
+class SolutionCache:
+    """LRU map from (engine, board, packed state) to a solution path."""
+
+    def __init__(self, maxsize=MAXSIZE):
+        if maxsize < 1:
+            raise ValueError("maxsize must be at least 1")
+        self.maxsize = maxsize
+        self.entries = OrderedDict()    # key -> (packed path, offset of the key's state)
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, engine, tiles, board=ps.DEFAULT):
+        """The cached path from ``tiles`` as a list of flat tuples, or None."""
+        key = (engine, board, board.pack(tiles))
+        entry = self.entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.entries.move_to_end(key)
+        codes, offset = entry
+        return [board.unpack(code) for code in codes[offset:]]
+
+    def put(self, engine, path, board=ps.DEFAULT):
+        """Cache ``path`` (start board to goal) as the solution of its first state.
+
+        Empty paths (unsolvable boards) are not cached.
+        """
+        if not path:
+            return
+        codes = tuple(board.pack(s) for s in path)
+        # Suffixes first, so the start board ends up most recently used.
+        first = len(codes) - 1 if engine in OPTIMAL else 0
+        for offset in range(first, -1, -1):
+            self._store((engine, board, codes[offset]), (codes, offset))
+
+    def _store(self, key, entry):
+        entries = self.entries
+        entries[key] = entry
+        entries.move_to_end(key)
+        if len(entries) > self.maxsize:
+            entries.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self):
+        self.entries.clear()
+        self.hits = self.misses = self.evictions = 0
+
+    def __len__(self):
+        return len(self.entries)
+
+    def stats(self):
+        return _with_hit_rate({
+            "size": len(self.entries),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        })
+
+
+def combine(stats):
+    """Totals of several :meth:`SolutionCache.stats` results, e.g. one per worker."""
+    total = dict.fromkeys(COUNTS, 0)
+    for s in stats:
+        for name in COUNTS:
+            total[name] += s[name]
+    return _with_hit_rate(total)
+
+
+def _with_hit_rate(stats):
+    lookups = stats["hits"] + stats["misses"]
+    stats["hit_rate"] = stats["hits"] / lookups if lookups else 0.0
+    return stats
@@ -0,0 +1,222 @@
+"""Divide-and-conquer A* solver (see divide&conquer.py)."""
+
+import random
+import heapq
+
+from puzzle import metrics
+from puzzle import state as ps
+from puzzle import patterndb
+from puzzle import heuristics
+from puzzle import stream
+from puzzle.heuristics import delta_for
+
+# ------------------ CONSTANTS ------------------
+GOAL = (1,2,3,4,5,6,7,8,0)
+DIRS=[(-1,0),(1,0),(0,-1),(0,1)]
+
+# Every function takes an optional board (puzzle.state.Board) and defaults
+# to the 3x3 puzzle; GOAL is the 3x3 goal.
+
+# -------------------------------------------------
+# MOVE GENERATOR
+# -------------------------------------------------
+def neighbors(state,board=ps.DEFAULT):
+    i=state.index(0)
+    r,c=divmod(i,board.cols)
+    res=[]
+    for dr,dc in DIRS:
+        nr,nc=r+dr,c+dc
+        if 0<=nr<board.rows and 0<=nc<board.cols:
+            j=nr*board.cols+nc
+            lst=list(state)
+            lst[i],lst[j]=lst[j],lst[i]
+            res.append(tuple(lst))
+    return res
+
+
+# -------------------------------------------------
+# HEURISTIC
+# -------------------------------------------------
+def h(state,board=ps.DEFAULT):
+    dist=0
+    for i,v in enumerate(state):
+        if v==0: continue
+        goal=v-1
+        r1,c1=divmod(i,board.cols)
+        r2,c2=divmod(goal,board.cols)
+        dist+=abs(r1-r2)+abs(c1-c2)
+    return dist
+
+
+# -------------------------------------------------
+# A* SOLVER (CONQUER STEP)
+# -------------------------------------------------
+# Search runs on packed ints (puzzle.state); goal_check receives a packed
+# state and heuristic(packed) estimates the distance to it. Without a
+# goal_check the goal is the board's goal, and a start that cannot reach
+# it returns None at once. A custom goal_check is not checked: the A*
+# explores the start's whole component when no packed state satisfies it.
+# dnc_solver's row goals are reachable from every board. Heap entries
+# carry no path: each state keeps a parent link and its best known g, and
+# the path is rebuilt once the goal is popped. Child heuristics are
+# updated in O(1) from the parent's when the heuristic has an incremental
+# form (heuristics.delta_for). The default heuristic is Manhattan distance.
+def astar(start, goal_check=None, heuristic=None, board=ps.DEFAULT, explored_states=None, run=None):
+    events=iter_astar(start,goal_check,heuristic,board,explored_states is not None,run)
+    return stream.collect(events,explored_states) or None
+
+
+# Generator mode of astar (see puzzle.stream): (EXPLORE, state) per
+# expanded state when explore is set, then the (MOVE, state) path. The
+# search stops without a path once cancel.is_set().
+def iter_astar(start, goal_check=None, heuristic=None, board=ps.DEFAULT, explore=False, run=None,
+               cancel=None):
+
+    code=board.pack(start)
+    if goal_check is None:
+        if not board.is_solvable(code):
+            return
+
+        def goal_check(s):
+            return s==board.goal
+
+    # run: the metrics run to count into (dnc_solver passes its own);
+    # by default each call starts an "astar" run while metrics are on.
+    rec=run if run is not None else metrics.start("astar")
+    generated=rec.generated if rec is not None else 0
+    pushed=0
+
+    def done():
+        if rec is not None:
+            rec.duplicates+=rec.generated-generated-pushed
+            rec.evaluations+=pushed+1
+            if run is None:
+                rec.finish()
+
+    if heuristic is None:
+        heuristic=heuristics.for_board(board).manhattan
+    update=delta_for(heuristic)
+    pq=[]
+    heapq.heappush(pq,(heuristic(code),0,code,board.blank_index(code)))
+    parent={code:None}
+    best_g={code:0}
+
+    while pq:
+        if cancel is not None and cancel.is_set():
+            break
+        f,g,state,blank=heapq.heappop(pq)
+
+        if g>best_g[state]:
+            continue        # superseded by a cheaper entry
+        if explore:
+            yield stream.EXPLORE,board.unpack(state)
+        if rec is not None:
+            rec.expand(len(pq)+1,len(board.moves[blank]))
+
+        if goal_check(state):
+            done()
+            for s in rebuild_path(parent,state,board):
+                yield stream.MOVE,s
+            return
+
+        h_state=f-g
+        g+=1
+        for nxt,nb in board.neighbors(state,blank):
+            if g<best_g.get(nxt,g+1):
+                best_g[nxt]=g
+                parent[nxt]=state
+                if update:
+                    h_nxt=update(h_state,state,blank,nb)
+                else:
+                    h_nxt=heuristic(nxt)
+                heapq.heappush(pq,(g+h_nxt,g,nxt,nb))
+                pushed+=1
+
+    done()
+
+
+def rebuild_path(parent,state,board=ps.DEFAULT):
+    path=[]
+    while state is not None:
+        path.append(board.unpack(state))
+        state=parent[state]
+    path.reverse()
+    return path
+
+
+# -------------------------------------------------
+# DIVIDE & CONQUER SOLVER
+# -------------------------------------------------
+def dnc_solver(state,board=ps.DEFAULT,explored_states=None):
+    events=iter_dnc(state,board,explored_states is not None)
+    return stream.collect(events,explored_states)
+
+
+# Generator mode of dnc_solver (see puzzle.stream). The start board is
+# yielded at once and the moves of each row stage as soon as that stage
+# is solved, before the remaining stages are searched. cancel is passed
+# to every stage, so the remaining stages end at once when it is set.
+def iter_dnc(state,board=ps.DEFAULT,explore=False,cancel=None):
+
+    goal=board.goal_tiles
+    if state == goal:
+        yield stream.MOVE,state
+        return
+    if not board.is_solvable(board.pack(state)):
+        return
+
+    run=metrics.start("dnc")
+    yield stream.MOVE,state
+    current=state
+    cols=board.cols
+
+    def stage(goal_check,heuristic=None):
+        # the stage's events, minus its first move (the current board)
+        nonlocal current
+        first=True
+        for kind,s in iter_astar(current,goal_check,heuristic,board,explore,run,cancel):
+            if kind is stream.MOVE:
+                if first:
+                    first=False
+                    continue
+                current=s
+            yield kind,s
+
+    # ---- DIVIDE → solve the top rows one at a time, leaving two ----
+    for r in range(board.rows-2):
+        if current[:(r+1)*cols] == goal[:(r+1)*cols]:
+            continue
+
+        prefix_mask=(1<<(board.bits*(r+1)*cols))-1     # bits of rows 0..r
+
+        def rows_goal(s,prefix_mask=prefix_mask):
+            return s&prefix_mask==board.goal&prefix_mask
+
+        if run is not None:
+            run.phase(f"row {r}")
+        yield from stage(rows_goal)
+
+    # ---- CONQUER → solve remaining ----
+    if run is not None:
+        run.phase("full goal")
+    yield from stage(None,patterndb.default(board))
+    if run is not None:
+        run.finish()
+
+
+# -------------------------------------------------
+# RANDOM BOARD
+# -------------------------------------------------
+def shuffle_board(board=ps.DEFAULT):
+    s=list(board.goal_tiles)
+    for _ in range(40):
+        i=s.index(0)
+        r,c=divmod(i,board.cols)
+        moves=[]
+        for dr,dc in DIRS:
+            nr,nc=r+dr,c+dc
+            if 0<=nr<board.rows and 0<=nc<board.cols:
+                moves.append(nr*board.cols+nc)
+        j=random.choice(moves)
+        s[i],s[j]=s[j],s[i]
+    return tuple(s)
@@ -0,0 +1,263 @@
+"""DP distance table and bidirectional BFS solvers (see dynamicprogram.py)."""
+
+import os
+
+from puzzle import metrics
+from puzzle import state as ps
+from puzzle import stream
+from puzzle import tablefile
+
+# ------------------ PATH SETUP ------------------
+
+DATA_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# ------------------ CONSTANTS ------------------
+
+GOAL_STATE = (1, 2, 3, 4, 5, 6, 7, 8, 0)
+DIRS = [(-1, 0), (1, 0), (0, -1), (0, 1)]
+
+# ------------------ TRUE DP TABLE ------------------
+
+# dp_table[ps.rank(state)] -> number of moves from state to the goal.
+# One byte per reachable board (181,440 bytes in total). The table is
+# saved to DP_TABLE_FILE the first time it is built and memory-mapped on
+# later runs. With NumPy installed the BFS runs a whole layer at a time
+# (puzzle.vectorized.bfs_table); otherwise bfs_table below is used.
+#
+# The table is kept for the 3x3 board only: a 4x4 board has over 10^13
+# reachable states. Bidirectional BFS covers the smaller boards (2x3,
+# 2x4, ...) and refuses larger ones.
+
+UNSEEN = 0xFF
+DP_TABLE_FILE = os.path.join(DATA_DIR, "dp_table.bin")
+dp_table = bytearray()
+
+
+def bfs_table(goal, progress=None, cancel=None, board=ps.DEFAULT):
+    """Breadth-first distances from goal, one layer at a time.
+
+    progress(discovered, depth) is called after every layer; the build
+    stops and returns None as soon as the cancel event is set.
+    """
+    table = bytearray([UNSEEN]) * board.num_states
+    table[board.rank(goal)] = 0
+
+    frontier = [goal]
+    depth = 0
+    discovered = 1
+
+    while frontier:
+        if cancel is not None and cancel.is_set():
+            return None
+
+        depth += 1
+        next_frontier = []
+
+        for curr in frontier:
+            for nxt, _ in board.neighbors(curr, board.blank_index(curr)):
+                r = board.rank(nxt)
+                if table[r] == UNSEEN:
+                    table[r] = depth
+                    next_frontier.append(nxt)
+
+        frontier = next_frontier
+        discovered += len(frontier)
+
+        if progress is not None and frontier:
+            progress(discovered, depth)
+
+    return table
+
+
+def build_dp_table(progress=None, cancel=None):
+    """Load or build dp_table. Returns False if the build was cancelled."""
+    global dp_table
+    if dp_table:
+        return True
+
+    run = metrics.start("dp_table")
+    if run is not None:
+        run.phase("load")
+    goal = ps.pack(GOAL_STATE)
+    table = tablefile.load(DP_TABLE_FILE, tablefile.DISTANCE, goal, ps.NUM_STATES)
+
+    if table is None:
+        if run is not None:
+            run.phase("build")
+            progress = _count_layers(run, progress)
+        try:
+            # NumPy is imported only when a table has to be built
+            from puzzle.vectorized import bfs_table as bfs
+        except ImportError:
+            bfs = bfs_table
+        table = bfs(goal, progress, cancel)
+        if table is None:
+            if run is not None:
+                run.finish()
+            return False
+        if run is not None:
+            run.phase("save")
+        try:
+            tablefile.save(DP_TABLE_FILE, tablefile.DISTANCE, goal, table)
+        except OSError:
+            pass    # read-only install: keep the in-memory table
+
+    if run is not None:
+        run.finish()
+    dp_table = table
+    return True
+
+
+def _count_layers(run, progress):
+    # Wrap a bfs_table progress callback to feed the metrics run: every
+    # discovered state is expanded once, and a layer is the frontier.
+    seen = [1]
+
+    def layer(discovered, depth):
+        frontier = discovered - seen[0]
+        seen[0] = discovered
+        run.expanded = discovered
+        run.frontier_max = max(run.frontier_max, frontier)
+        if progress is not None:
+            progress(discovered, depth)
+
+    return layer
+
+
+def check_table_board(board):
+    if board is not ps.DEFAULT:
+        raise ValueError(
+            f"the DP table covers the 3x3 board only "
+            f"({board.rows}x{board.cols} has {board.num_states:,} states)"
+        )
+
+
+def reconstruct_path(start, board=ps.DEFAULT, explored_states=None):
+    """Walk dp_table downhill from start; [] if start cannot be solved.
+
+    Every state whose neighbours are probed is appended to explored_states.
+    """
+    events = iter_path(start, board, explored_states is not None)
+    return stream.collect(events, explored_states)
+
+
+def iter_path(start, board=ps.DEFAULT, explore=False, cancel=None):
+    """Generator mode of reconstruct_path (see puzzle.stream).
+
+    Each move is yielded as soon as the table lookup finds it, so the
+    first one arrives after a single step. The walk stops once
+    cancel.is_set().
+    """
+    check_table_board(board)
+    curr = ps.pack(start)
+    if not ps.is_solvable(curr):
+        return
+    try:
+        dist = dp_table[ps.rank(curr)]
+    except (ValueError, IndexError):
+        return
+    if dist == UNSEEN:
+        return
+
+    yield stream.MOVE, start
+
+    while dist:
+        if cancel is not None and cancel.is_set():
+            return
+        dist -= 1
+        if explore:
+            yield stream.EXPLORE, ps.unpack(curr)
+        for nxt, _ in ps.neighbors(curr, ps.blank_index(curr)):
+            if dp_table[ps.rank(nxt)] == dist:
+                curr = nxt
+                break
+        yield stream.MOVE, ps.unpack(curr)
+
+
+# ------------------ BIDIRECTIONAL BFS ------------------
+
+def bidirectional_path(start, board=ps.DEFAULT, explored_states=None):
+    """Optimal path from start to the board's goal without the full dp_table.
+
+    Breadth-first layers grow alternately from both ends (always the
+    smaller frontier) until they meet. Returns the same list of tuples as
+    reconstruct_path, or [] if the goal is unreachable. Expanded states
+    from both directions are appended to explored_states. Boards larger
+    than 3x3 raise ValueError.
+    """
+    events = iter_bidirectional(start, board, explored_states is not None)
+    return stream.collect(events, explored_states)
+
+
+def iter_bidirectional(start, board=ps.DEFAULT, explore=False):
+    """Generator mode of bidirectional_path (see puzzle.stream).
+
+    The path is only known once the two searches meet; exploration events
+    stream while they grow. Raises ValueError for boards larger than 3x3
+    (see :func:`puzzle.state.check_exhaustive`).
+    """
+    ps.check_exhaustive(board, "bidirectional BFS")
+    src = board.pack(start)
+    dst = board.goal
+    if src == dst:
+        yield stream.MOVE, start
+        return
+    if not board.is_solvable(src):
+        return
+
+    # packed state -> packed parent, for each search direction
+    fwd = {src: None}
+    bwd = {dst: None}
+    fwd_frontier = [src]
+    bwd_frontier = [dst]
+
+    while fwd_frontier and bwd_frontier:
+        if len(fwd_frontier) <= len(bwd_frontier):
+            frontier, seen, other = fwd_frontier, fwd, bwd
+        else:
+            frontier, seen, other = bwd_frontier, bwd, fwd
+
+        # Expand one whole layer. Every meeting found in the first layer
+        # that meets has the same forward+backward depth, so any of them
+        # gives an optimal path.
+        next_frontier = []
+        meet = None
+        for curr in frontier:
+            if explore:
+                yield stream.EXPLORE, board.unpack(curr)
+            for nxt, _ in board.neighbors(curr, board.blank_index(curr)):
+                if nxt in seen:
+                    continue
+                seen[nxt] = curr
+                if nxt in other:
+                    meet = nxt
+                    break
+                next_frontier.append(nxt)
+            if meet is not None:
+                break
+
+        if meet is not None:
+            for state in _join_paths(fwd, bwd, meet, board):
+                yield stream.MOVE, state
+            return
+
+        if seen is fwd:
+            fwd_frontier = next_frontier
+        else:
+            bwd_frontier = next_frontier
+
+
+def _join_paths(fwd, bwd, meet, board=ps.DEFAULT):
+    head = []
+    curr = meet
+    while curr is not None:
+        head.append(curr)
+        curr = fwd[curr]
+    head.reverse()
+
+    curr = bwd[meet]
+    while curr is not None:
+        head.append(curr)
+        curr = bwd[curr]
+
+    return [board.unpack(code) for code in head]
@@ -0,0 +1,223 @@
+"""Greedy best-first solver with a sparse adjacency graph (see greedyalgo.py)."""
+
+from array import array
+import heapq
+from functools import lru_cache
+from itertools import count
+
+from puzzle import heuristics
+from puzzle import metrics
+from puzzle import patterndb
+from puzzle import state as ps
+from puzzle import stream
+
+# ------------------ CONSTANTS ------------------
+
+GOAL = [[1, 2, 3],
+        [4, 5, 6],
+        [7, 8, 0]]
+
+DIRS = [(-1, 0), (1, 0), (0, -1), (0, 1)]
+
+# ------------------ SPARSE ADJACENCY GRAPH ------------------
+
+# A puzzle state has at most 4 neighbours, so every state owns a fixed
+# block of MAX_NEIGHBORS slots in a flat int array (-1 marks an empty slot).
+# Slot d holds the neighbour reached by moving the blank in DIRS[d], so the
+# reverse edge always lives in slot d ^ 1 of the neighbour.
+# Memory grows linearly with the number of states visited.
+
+MAX_NEIGHBORS = 4
+EMPTY_SLOTS = array("i", [-1] * MAX_NEIGHBORS)
+
+@lru_cache(maxsize=None)
+def slots_for(board):
+    # slots_for(board)[blank] -> ((d, target), ...) for every legal blank move
+    cols = board.cols
+    return tuple(
+        tuple((d, (b // cols + dr) * cols + b % cols + dc)
+              for d, (dr, dc) in enumerate(DIRS)
+              if 0 <= b // cols + dr < board.rows and 0 <= b % cols + dc < cols)
+        for b in range(board.size)
+    )
+
+SLOTS = slots_for(ps.DEFAULT)
+
+# The graph holds the states of one board at a time (graph_board);
+# greedy_solver starts a fresh graph when it is given another board.
+graph_board = ps.DEFAULT
+state_index = {}     # packed state -> index
+index_state = {}     # index -> packed state
+adj_table = array("i")   # neighbour table, MAX_NEIGHBORS slots per state
+
+def reset_graph(board=ps.DEFAULT):
+    global graph_board
+    graph_board = board
+    state_index.clear()
+    index_state.clear()
+    del adj_table[:]
+
+def add_code(code):
+    idx = state_index.get(code)
+    if idx is None:
+        idx = len(state_index)
+        state_index[code] = idx
+        index_state[idx] = code
+        adj_table.extend(EMPTY_SLOTS)
+
+    return idx
+
+def add_state(state):
+    return add_code(graph_board.from_grid(state))
+
+def add_edge(s1, s2):
+    i = add_state(s1)
+    j = add_state(s2)
+    cols = graph_board.cols
+    db = (graph_board.blank_index(index_state[j])
+          - graph_board.blank_index(index_state[i]))
+    d = {-cols: 0, cols: 1, -1: 2, 1: 3}[db]
+    adj_table[i * MAX_NEIGHBORS + d] = j
+    adj_table[j * MAX_NEIGHBORS + (d ^ 1)] = i   # undirected graph
+
+def neighbors_of(idx):
+    base = idx * MAX_NEIGHBORS
+    return [j for j in adj_table[base:base + MAX_NEIGHBORS] if j != -1]
+
+# ------------------ UTILITY FUNCTIONS ------------------
+
+def find_zero(state):
+    for r, row in enumerate(state):
+        for c, v in enumerate(row):
+            if v == 0:
+                return r, c
+
+def manhattan(state):
+    d = 0
+    cols = len(state[0])
+    for r, row in enumerate(state):
+        for c, v in enumerate(row):
+            if v != 0:
+                tr, tc = divmod(v - 1, cols)
+                d += abs(r - tr) + abs(c - tc)
+    return d
+
+def linear_conflict(state):
+    # rows and columns of a grid of any shape; see puzzle.heuristics
+    board = ps.get_board(len(state), len(state[0]))
+    return heuristics.for_board(board).linear_conflict(board.from_grid(state))
+
+# ------------------ MERGE SORT ------------------
+
+# Stand-alone sort utility for (priority, ...) tuples. The greedy solver
+# keeps its frontier in a binary heap instead.
+
+def merge_sort(arr):
+    if len(arr) <= 1:
+        return arr
+
+    mid = len(arr) // 2
+    left = merge_sort(arr[:mid])
+    right = merge_sort(arr[mid:])
+
+    return merge(left, right)
+
+def merge(left, right):
+    result = []
+    i = j = 0
+
+    while i < len(left) and j < len(right):
+        if left[i][0] < right[j][0]:
+            result.append(left[i])
+            i += 1
+        else:
+            result.append(right[j])
+            j += 1
+
+    result.extend(left[i:])
+    result.extend(right[j:])
+    return result
+
+# ------------------ GREEDY SOLVER (WITH ADJ TABLE) ------------------
+
+def greedy_solver(start, heuristic=None, board=ps.DEFAULT, explored_states=None):
+    # Returns the solution as a list of grids, [] when there is none.
+    # Expanded states are appended to explored_states as flat tuples.
+    events = iter_greedy(start, heuristic, board, explored_states is not None)
+    return [board.to_grid(board.pack(s)) for s in stream.collect(events, explored_states)]
+
+def iter_greedy(start, heuristic=None, board=ps.DEFAULT, explore=False, cancel=None):
+    # Generator mode of greedy_solver (see puzzle.stream): yields
+    # (EXPLORE, state) per expanded state when explore is set, then the
+    # (MOVE, state) solution. start is a grid.
+    # Search runs on packed states (puzzle.state): children come from O(1)
+    # blank moves, and each state keeps one parent link instead of a copied
+    # path. heuristic takes a packed state and defaults to the board's
+    # pattern database. Boards that cannot reach the goal yield no moves,
+    # and the search stops once cancel.is_set() (see puzzle.stream).
+    code = board.from_grid(start)
+    if not board.is_solvable(code):
+        return
+
+    if heuristic is None:
+        heuristic = patterndb.default(board)
+    update = heuristics.delta_for(heuristic)
+    run = metrics.start("greedy")
+    if board is not graph_board:
+        reset_graph(board)
+    slots = slots_for(board)
+
+    # Frontier entries are (h, tie, state, blank). The insertion counter
+    # breaks ties first-in-first-out. A state is pushed only the first
+    # time it is generated; h depends on the state alone, so later copies
+    # could never be popped ahead of it.
+    tie = count()
+    open_list = [(heuristic(code), next(tie), code, board.blank_index(code))]
+    parent = {code: None}
+
+    add_code(code)
+    push, pop = heapq.heappush, heapq.heappop
+    bits, mask = board.bits, board.mask
+
+    while open_list:
+        if cancel is not None and cancel.is_set():
+            break
+        h_state, _, state, blank = pop(open_list)
+        if explore:
+            yield stream.EXPLORE, board.unpack(state)
+        if run is not None:
+            run.expand(len(open_list) + 1, len(slots[blank]))
+
+        if state == board.goal:
+            if run is not None:
+                run.finish(pushed=len(parent) - 1, evaluations=len(parent))
+            path = []
+            while state is not None:
+                path.append(state)
+                state = parent[state]
+            for state in reversed(path):
+                yield stream.MOVE, board.unpack(state)
+            return
+
+        i = state_index[state]
+
+        for d, nb in slots[blank]:
+            tile = (state >> (bits * nb)) & mask
+            nxt = state ^ (tile << (bits * nb)) ^ (tile << (bits * blank))
+
+            j = state_index.get(nxt)
+            if j is None:
+                j = add_code(nxt)
+            adj_table[i * MAX_NEIGHBORS + d] = j
+            adj_table[j * MAX_NEIGHBORS + (d ^ 1)] = i
+
+            if nxt not in parent:
+                parent[nxt] = state
+                if update:
+                    h = update(h_state, state, blank, nb)
+                else:
+                    h = heuristic(nxt)
+                push(open_list, (h, next(tie), nxt, nb))
+
+    if run is not None:
+        run.finish(pushed=len(parent) - 1, evaluations=len(parent))
@@ -0,0 +1,171 @@
+"""Admissible heuristics over packed boards (see :mod:`puzzle.state`).
+
+:class:`Heuristics` holds the lookup tables for one board; the
+module-level functions are those of the 3x3 board.
+"""
+
+from functools import lru_cache
+
+from puzzle import state as ps
+
+
+class _LineTable(dict):
+    """Line key -> tiles that must leave the line, filled in on first lookup."""
+
+    def __init__(self, board, length, in_line, slot):
+        super().__init__()
+        self.board = board
+        self.length = length
+        self.in_line = in_line
+        self.slot = slot
+
+    def __missing__(self, key):
+        bits, mask = self.board.bits, self.board.mask
+        order = [self.slot(t) for t in
+                 ((key >> (bits * k)) & mask for k in range(self.length))
+                 if 0 < t < self.board.size and self.in_line(t)]
+        longest = [1] * len(order)
+        for i in range(len(order)):
+            for j in range(i):
+                if order[j] < order[i] and longest[j] + 1 > longest[i]:
+                    longest[i] = longest[j] + 1
+        value = self[key] = len(order) - max(longest, default=0)
+        return value
+
+
+class Heuristics:
+    """Manhattan distance and linear conflict for one :class:`~puzzle.state.Board`."""
+
+    def __init__(self, board):
+        self.board = board
+        cols = board.cols
+
+        # manhattan_table[tile][cell] -> distance of ``tile`` in ``cell`` from its goal cell
+        self.goal_cell = {t: i for i, t in enumerate(board.goal_tiles) if t}
+        self.manhattan_table = [[0] * board.size]
+        for v in range(1, board.size):
+            gr, gc = divmod(self.goal_cell[v], cols)
+            self.manhattan_table.append([abs(i // cols - gr) + abs(i % cols - gc)
+                                         for i in range(board.size)])
+
+        # Two tiles are in linear conflict when both belong in the line (row
+        # or column) they are in but appear in reverse order. Resolving a
+        # line takes at least two extra moves for every tile outside the
+        # longest run of its home tiles that is already in goal order, which
+        # keeps the sum admissible (counting each conflicting pair instead
+        # would overestimate reversed triples).
+        #
+        # A line is keyed by its tiles packed ``bits`` apart, cell 0 of the
+        # line in the low bits; rows are then just a shift and mask of the
+        # board.
+        goal_cell = self.goal_cell
+        self.row_bits = board.bits * cols
+        self.row_mask = (1 << self.row_bits) - 1
+        self.row_conflicts = [
+            _LineTable(board, cols, lambda t, r=r: goal_cell[t] // cols == r,
+                       lambda t: goal_cell[t] % cols)
+            for r in range(board.rows)
+        ]
+        self.col_conflicts = [
+            _LineTable(board, board.rows, lambda t, c=c: goal_cell[t] % cols == c,
+                       lambda t: goal_cell[t] // cols)
+            for c in range(cols)
+        ]
+
+    # ------------------ MANHATTAN ------------------
+
+    def manhattan(self, code):
+        bits, mask, table = self.board.bits, self.board.mask, self.manhattan_table
+        dist = 0
+        for i in range(self.board.size):
+            v = (code >> (bits * i)) & mask
+            if v:
+                dist += table[v][i]
+        return dist
+
+    def manhattan_delta(self, value, code, blank, target):
+        """Manhattan distance of the child reached by sliding ``target`` into ``blank``."""
+        v = (code >> (self.board.bits * target)) & self.board.mask
+        return value + self.manhattan_table[v][blank] - self.manhattan_table[v][target]
+
+    # ------------------ LINEAR CONFLICT ------------------
+
+    def row_key(self, code, r):
+        return (code >> (self.row_bits * r)) & self.row_mask
+
+    def col_key(self, code, c):
+        board = self.board
+        key = 0
+        for k in range(board.rows):
+            key |= ((code >> (board.bits * (k * board.cols + c))) & board.mask) << (board.bits * k)
+        return key
+
+    def linear_conflict(self, code):
+        """Manhattan distance plus two moves per tile that must leave its line."""
+        conflicts = 0
+        for r, table in enumerate(self.row_conflicts):
+            conflicts += table[self.row_key(code, r)]
+        for c, table in enumerate(self.col_conflicts):
+            conflicts += table[self.col_key(code, c)]
+        return self.manhattan(code) + 2 * conflicts
+
+    def linear_conflict_delta(self, value, code, blank, target):
+        """Incremental :meth:`linear_conflict` for one slide, in O(1).
+
+        A slide moves one tile between two rows (vertical) or two columns
+        (horizontal) and leaves the order of every other line unchanged, so
+        only those two lines are recounted.
+        """
+        value = self.manhattan_delta(value, code, blank, target)
+        child = self.board.move_blank(code, blank, target)
+        r_from, c_from = divmod(target, self.board.cols)
+        r_to, c_to = divmod(blank, self.board.cols)
+
+        if r_from != r_to:
+            table, key, a, b = self.row_conflicts, self.row_key, r_from, r_to
+        else:
+            table, key, a, b = self.col_conflicts, self.col_key, c_from, c_to
+        delta = (table[a][key(child, a)] + table[b][key(child, b)]
+                 - table[a][key(code, a)] - table[b][key(code, b)])
+        return value + 2 * delta
+
+
+@lru_cache(maxsize=None)
+def for_board(board):
+    return DEFAULT if board is ps.DEFAULT else Heuristics(board)
+
+
+# ------------------ INCREMENTAL UPDATES ------------------
+
+
+def delta_for(heuristic):
+    """The O(1) update for ``heuristic``, or None if it must be recomputed.
+
+    An update is called as ``update(parent_value, parent_code, blank,
+    target)`` and returns the heuristic of the child reached by sliding
+    the tile at ``target`` into ``blank``. Heuristics with an update are
+    the :class:`Heuristics` methods that have a ``<name>_delta`` partner.
+    """
+    owner = getattr(heuristic, "__self__", None)
+    if isinstance(owner, Heuristics):
+        return getattr(owner, heuristic.__name__ + "_delta", None)
+    return None
+
+
+# ------------------ DEFAULT 3x3 BOARD ------------------
+
+DEFAULT = Heuristics(ps.DEFAULT)
+
+GOAL_CELL = DEFAULT.goal_cell
+MANHATTAN = DEFAULT.manhattan_table
+ROW_BITS = DEFAULT.row_bits
+ROW_MASK = DEFAULT.row_mask
+ROW_CONFLICTS = DEFAULT.row_conflicts
+COL_CONFLICTS = DEFAULT.col_conflicts
+
+manhattan = DEFAULT.manhattan
+manhattan_delta = DEFAULT.manhattan_delta
+linear_conflict = DEFAULT.linear_conflict
+linear_conflict_delta = DEFAULT.linear_conflict_delta
+row_key = DEFAULT.row_key
+col_key = DEFAULT.col_key
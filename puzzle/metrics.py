@@ -0,0 +1,175 @@
+"""Solver counters and phase timings, off unless a registry is enabled.
+
+Solvers call :func:`start` once per solve. While metrics are disabled it
+returns None and each solver skips its bookkeeping with a single
+``is not None`` test per expanded node. After :func:`enable`, every solve
+gets a :class:`Run` that counts
+
+* ``expanded``   states taken off the frontier and expanded,
+* ``generated``  children produced by those expansions,
+* ``duplicates`` children dropped as already seen (or not improved),
+* ``evaluations`` heuristic evaluations,
+* ``frontier_max`` the frontier (or stack) high-water mark,
+
+and times named phases, e.g. each row stage of ``dnc_solver``. Finished
+runs are added to the :class:`Registry`, which can pass each one to a
+structured log and dump the totals as Prometheus text::
+
+    registry = metrics.enable(log=metrics.json_lines(sys.stderr))
+    ...
+    print(registry.prometheus())
+"""
+
+import json
+import threading
+from time import perf_counter
+
+COUNTERS = ("expanded", "generated", "duplicates", "evaluations")
+
+
+class Run:
+    """Counters of one solver call."""
+
+    __slots__ = ("engine", "registry", "expanded", "generated", "duplicates",
+                 "evaluations", "frontier_max", "phases", "seconds",
+                 "_phase", "_mark", "_start")
+
+    def __init__(self, engine, registry):
+        self.engine = engine
+        self.registry = registry
+        self.expanded = 0
+        self.generated = 0
+        self.duplicates = 0
+        self.evaluations = 0
+        self.frontier_max = 0
+        self.phases = {}
+        self.seconds = 0.0
+        self._phase = None
+        self._start = self._mark = perf_counter()
+
+    def expand(self, frontier, children):
+        """One expansion with ``frontier`` entries pending and ``children`` generated."""
+        self.expanded += 1
+        self.generated += children
+        if frontier > self.frontier_max:
+            self.frontier_max = frontier
+
+    def phase(self, name):
+        """End the current phase (if any) and start timing ``name``."""
+        now = perf_counter()
+        if self._phase is not None:
+            self.phases[self._phase] = self.phases.get(self._phase, 0.0) + now - self._mark
+        self._phase, self._mark = name, now
+
+    def finish(self, pushed=None, evaluations=None):
+        """Close the run and add it to the registry.
+
+        ``pushed`` is the number of children that entered the frontier; the
+        rest of ``generated`` are counted as duplicates.
+        """
+        self.phase(None)
+        self.seconds = perf_counter() - self._start
+        if pushed is not None:
+            self.duplicates += self.generated - pushed
+        if evaluations is not None:
+            self.evaluations += evaluations
+        self.registry.record(self)
+
+    def as_dict(self):
+        return {
+            "engine": self.engine,
+            "seconds": self.seconds,
+            "expanded": self.expanded,
+            "generated": self.generated,
+            "duplicates": self.duplicates,
+            "evaluations": self.evaluations,
+            "frontier_max": self.frontier_max,
+            "phases": dict(self.phases),
+        }
+
+
+class Registry:
+    """Per-engine totals of every finished :class:`Run`."""
+
+    def __init__(self, log=None):
+        self.log = log
+        self.totals = {}
+        self._lock = threading.Lock()
+
+    def record(self, run):
+        with self._lock:
+            t = self.totals.get(run.engine)
+            if t is None:
+                t = self.totals[run.engine] = dict.fromkeys(COUNTERS, 0)
+                t.update(solves=0, seconds=0.0, frontier_max=0, phases={})
+            t["solves"] += 1
+            t["seconds"] += run.seconds
+            for name in COUNTERS:
+                t[name] += getattr(run, name)
+            t["frontier_max"] = max(t["frontier_max"], run.frontier_max)
+            for name, seconds in run.phases.items():
+                t["phases"][name] = t["phases"].get(name, 0.0) + seconds
+        if self.log is not None:
+            self.log(run.as_dict())
+
+    def prometheus(self, prefix="puzzle"):
+        """The totals in the Prometheus text exposition format."""
+        with self._lock:
+            totals = {engine: dict(t, phases=dict(t["phases"])) for engine, t in self.totals.items()}
+
+        lines = []
+
+        def family(name, kind, text, samples):
+            lines.append(f"# HELP {prefix}_{name} {text}")
+            lines.append(f"# TYPE {prefix}_{name} {kind}")
+            for labels, value in samples:
+                label_text = ",".join(f'{k}="{v}"' for k, v in labels)
+                lines.append(f"{prefix}_{name}{{{label_text}}} {value}")
+
+        engines = sorted(totals)
+        family("solves_total", "counter", "Solver calls.",
+               [((("engine", e),), totals[e]["solves"]) for e in engines])
+        family("solve_seconds_total", "counter", "Wall time spent in solver calls.",
+               [((("engine", e),), totals[e]["seconds"]) for e in engines])
+        for name, text in (("expanded", "States expanded."),
+                           ("generated", "Children generated."),
+                           ("duplicates", "Children pruned as already seen."),
+                           ("evaluations", "Heuristic evaluations.")):
+            family(f"nodes_{name}_total", "counter", text,
+                   [((("engine", e),), totals[e][name]) for e in engines])
+        family("frontier_max", "gauge", "Largest frontier or stack seen.",
+               [((("engine", e),), totals[e]["frontier_max"]) for e in engines])
+        family("phase_seconds_total", "counter", "Wall time per solver phase.",
+               [((("engine", e), ("phase", p)), s)
+                for e in engines for p, s in sorted(totals[e]["phases"].items())])
+        return "\n".join(lines) + "\n"
+
+
+def json_lines(stream):
+    """A ``log`` callable writing one JSON object per run to ``stream``."""
+    def log(record):
+        stream.write(json.dumps(record) + "\n")
+    return log
+
+
+# ------------------ GLOBAL HOOK ------------------
+
+_registry = None
+
+
+def enable(registry=None, log=None):
+    """Start recording into ``registry`` (a new one by default) and return it."""
+    global _registry
+    _registry = registry if registry is not None else Registry(log)
+    return _registry
+
+
+def disable():
+    global _registry
+    _registry = None
+
+
+def start(engine):
+    """A :class:`Run` for one solve of ``engine``, or None while disabled."""
+    registry = _registry
+    return None if registry is None else Run(engine, registry)
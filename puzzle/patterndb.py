@@ -0,0 +1,137 @@
+"""Additive pattern databases over packed boards (see :mod:`puzzle.state`).
+
+The tiles are split into disjoint groups. For each group, a table stores
+the fewest moves *of that group's tiles* needed to bring them home from
+any placement and blank cell, with all other tiles treated as
+indistinguishable and free to move. Costs of different groups never
+overlap, so the sum of the group lookups is an admissible and consistent
+heuristic that dominates Manhattan distance.
+
+Each group's table is indexed by ``placement * size + blank``, where
+``placement`` spells the cells of the group's tiles in base ``size`` (the
+board's cell count), one byte per entry, and is cached on disk in the
+:mod:`puzzle.tablefile` format.
+"""
+
+import os
+from collections import deque
+
+from puzzle import state as ps
+from puzzle import tablefile
+
+DEFAULT_GROUPS = ((1, 2, 3, 4), (5, 6, 7, 8))
+# Larger boards are split into runs of this many tiles: a group of k tiles
+# needs size ** (k + 1) table bytes.
+GROUP_SIZE = 4
+DATA_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+UNSEEN = 0xFF
+
+
+def default_groups(board=ps.DEFAULT):
+    if board is ps.DEFAULT:
+        return DEFAULT_GROUPS
+    tiles = list(range(1, board.size))
+    return tuple(tuple(tiles[i:i + GROUP_SIZE]) for i in range(0, len(tiles), GROUP_SIZE))
+
+
+def table_path(group, data_dir=None, board=ps.DEFAULT):
+    return os.path.join(data_dir or DATA_DIR, "pdb_%dx%d_%s.bin" % (
+        board.rows, board.cols, "-".join(map(str, group))))
+
+
+def build_table(group, board=ps.DEFAULT):
+    """0-1 BFS over (placement of group tiles, blank cell) from the goal."""
+    cells = board.size
+    weights = [cells ** j for j in range(len(group))]
+    dist = bytearray([UNSEEN]) * cells ** (len(group) + 1)
+    home = sum(board.goal_tiles.index(t) * w for t, w in zip(group, weights))
+    start = home * cells + board.goal_tiles.index(0)
+    dist[start] = 0
+    queue = deque([start])
+
+    while queue:
+        node = queue.popleft()
+        d = dist[node]
+        place, blank = divmod(node, cells)
+
+        occupant = {}
+        rest = place
+        for j in range(len(group)):
+            rest, cell = divmod(rest, cells)
+            occupant[cell] = j
+
+        for target in board.moves[blank]:
+            j = occupant.get(target)
+            if j is None:
+                # a don't-care tile slides: free
+                nxt, nd = place * cells + target, d
+            else:
+                nxt, nd = (place + (blank - target) * weights[j]) * cells + target, d + 1
+            if nd < dist[nxt]:
+                dist[nxt] = nd
+                if nd == d:
+                    queue.appendleft(nxt)
+                else:
+                    queue.append(nxt)
+
+    return dist
+
+
+class PatternDatabase:
+    """Callable heuristic: ``pdb(code)`` sums the group tables for a board."""
+
+    def __init__(self, groups, tables, board=ps.DEFAULT):
+        self.groups = groups
+        self.tables = tables
+        self.board = board
+        # weight[tile] multiplies the tile's cell into its group's index;
+        # the blank contributes its cell to every group.
+        self.group_of = [-1] * board.size
+        self.weight = [0] * board.size
+        for g, group in enumerate(groups):
+            for j, tile in enumerate(group):
+                self.group_of[tile] = g
+                self.weight[tile] = board.size ** (j + 1)
+
+    def __call__(self, code):
+        group_of, weight = self.group_of, self.weight
+        bits, mask = self.board.bits, self.board.mask
+        index = [0] * len(self.groups)
+        blank = 0
+        for i in range(self.board.size):
+            v = (code >> (bits * i)) & mask
+            if not v:
+                blank = i
+                continue
+            g = group_of[v]
+            if g >= 0:
+                index[g] += i * weight[v]
+        return sum(table[x + blank] for table, x in zip(self.tables, index))
+
+
+def load_or_build(groups=None, data_dir=None, board=ps.DEFAULT):
+    if groups is None:
+        groups = default_groups(board)
+    tables = []
+    for group in groups:
+        path = table_path(group, data_dir, board)
+        length = board.size ** (len(group) + 1)
+        table = tablefile.load(path, tablefile.PATTERN, board.goal, length)
+        if table is None:
+            table = build_table(group, board)
+            try:
+                tablefile.save(path, tablefile.PATTERN, board.goal, table)
+            except OSError:
+                pass
+        tables.append(table)
+    return PatternDatabase(groups, tables, board)
+
+
+_default = {}
+
+
+def default(board=ps.DEFAULT):
+    """The board's default database, loaded (or built) on first use."""
+    if board not in _default:
+        _default[board] = load_or_build(board=board)
+    return _default[board]
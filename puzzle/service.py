@@ -0,0 +1,365 @@
+"""Long-running solve service speaking newline-delimited JSON.
+
+Run as ``python -m puzzle.service [--port P | --unix PATH]``. Every line a
+client sends is one JSON object. A solve request::
+
+    {"id": 1, "board": [8, 6, 7, 2, 5, 4, 3, 0, 1], "engine": "dnc", "deadline": 2.5}
+
+``id`` is required, a string or a number that no other open request of
+the connection uses. ``engine`` is one of :data:`puzzle.batch.ENGINES`
+(default "dp"), ``rows``/``cols`` default to 3 and ``deadline`` (a finite
+number of seconds, counted from the moment the request is read) to the
+server's, which also caps it. The reply is one line per state of the
+solution, start board first, then a closing line with the number of
+moves, -1 for an unsolvable board::
+
+    {"id": 1, "move": [8, 6, 7, 2, 5, 4, 3, 0, 1]}
+    ...
+    {"id": 1, "done": true, "moves": 31}
+
+A request that fails ends with ``{"id": 1, "error": "..."}`` instead: a
+malformed request, an unknown engine, a board size the service was not
+started for, or an exceeded deadline. ``{"cancel": 1}`` cancels request 1
+and is answered ``{"id": 1, "cancelled": true}``; closing the connection
+cancels all of its requests. ``{"id": 2, "stats": true}`` is answered with
+the workers' combined solution cache statistics::
+
+    {"id": 2, "stats": {"workers": 4, "hits": 130, "misses": 270, "hit_rate": 0.325, ...}}
+
+Replies to different requests of one connection may interleave.
+
+Solves run in a process pool whose workers map the DP table and pattern
+databases once, when they start; the service builds missing table files
+before it listens. Each worker keeps a :class:`~puzzle.cache.SolutionCache`
+of the boards it solved. At most ``max_concurrent`` jobs are in the pool at
+a time, across all clients, and each connection may have at most
+:data:`MAX_IN_FLIGHT` requests open before the service stops reading from
+it. A worker cannot be interrupted from outside, so the engine is given a
+:class:`Deadline` as its ``cancel`` flag (see :mod:`puzzle.stream`) and
+stops itself: a cancelled solve that is already running stops at its
+deadline at the latest, and its job keeps its ``max_concurrent`` slot
+until then.
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from puzzle import batch
+from puzzle import cache as solution_cache
+from puzzle import dp
+from puzzle import patterndb
+from puzzle import state as ps
+from puzzle import stream
+
+HOST = "127.0.0.1"
+PORT = 8765
+DEADLINE = 30.0
+MAX_IN_FLIGHT = 16
+# Deadline.is_set() calls between two reads of the clock
+CHECK_EVERY = 256
+
+
+# ------------------ WORKERS ------------------
+
+def prepare_tables(sizes):
+    """Load the tables every engine needs on boards of ``sizes``, building missing files."""
+    for rows, cols in sizes:
+        board = ps.get_board(rows, cols)
+        if board is ps.DEFAULT:
+            dp.build_dp_table()
+        patterndb.default(board)
+
+
+class Deadline:
+    """Cancel flag for the engines that is set once time.time() passes ``at``.
+
+    The engines call is_set() once per expanded state; the clock is read
+    every CHECK_EVERY calls, and once passed the flag stays set.
+    """
+
+    __slots__ = ("at", "calls", "passed")
+
+    def __init__(self, at):
+        self.at = at
+        self.calls = 0
+        self.passed = False
+
+    def is_set(self):
+        if not self.passed:
+            self.calls += 1
+            if self.calls % CHECK_EVERY == 0 and time.time() > self.at:
+                self.passed = True
+        return self.passed
+
+
+_cache = None       # this worker's SolutionCache, if any
+
+
+def _init_worker(sizes, cache_size):
+    global _cache
+    prepare_tables(sizes)
+    _cache = solution_cache.SolutionCache(cache_size) if cache_size else None
+
+
+def _solve(engine, tiles, rows, cols, deadline):
+    # Runs in a worker: the solution as a list of lists ([] if there is
+    # none), this worker's pid and its cache statistics. Raises
+    # TimeoutError once time.time() passes deadline; the search itself
+    # stops there through its cancel flag.
+    if time.time() > deadline:
+        raise TimeoutError
+    board = ps.get_board(rows, cols)
+    if _cache is not None:
+        path = _cache.get(engine, tiles, board)
+        if path is not None:
+            return [list(state) for state in path], os.getpid(), _cache.stats()
+    cancel = Deadline(deadline)
+    path = [list(state) for state in stream.moves(batch.iter_solve(engine, tiles, board,
+                                                                    cancel=cancel))]
+    if cancel.passed:
+        raise TimeoutError
+    if _cache is None:
+        return path, os.getpid(), None
+    _cache.put(engine, path, board)
+    return path, os.getpid(), _cache.stats()
+
+
+# ------------------ SERVICE ------------------
+
+class SolveService:
+    """Serves solve requests from any number of connections (see module docstring)."""
+
+    def __init__(self, workers=None, max_concurrent=None, deadline=DEADLINE, sizes=((3, 3),),
+                 cache_size=solution_cache.MAXSIZE):
+        self.workers = workers or os.cpu_count() or 1
+        self.max_concurrent = max_concurrent or 2 * self.workers
+        self.deadline = deadline
+        self.sizes = {tuple(size) for size in sizes}
+        self.cache_size = cache_size
+        self.pool = None
+        self.limit = None
+        self.cache_stats = {}   # worker pid -> its cache statistics after its last solve
+
+    async def start(self):
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, prepare_tables, self.sizes)
+        self.pool = ProcessPoolExecutor(self.workers, initializer=_init_worker,
+                                        initargs=(self.sizes, self.cache_size))
+        # Start the workers before any socket is open: a forked worker
+        # would otherwise inherit client connections and keep them open.
+        await asyncio.wrap_future(self.pool.submit(os.getpid))
+        self.limit = asyncio.Semaphore(self.max_concurrent)
+
+    def close(self):
+        if self.pool is not None:
+            self.pool.shutdown(wait=False, cancel_futures=True)
+            self.pool = None
+
+    def stats(self):
+        """Combined cache statistics of the workers that have solved a board."""
+        stats = solution_cache.combine(self.cache_stats.values())
+        stats["workers"] = len(self.cache_stats)
+        return stats
+
+    def parse(self, request):
+        """``(engine, tiles, rows, cols, seconds)`` of a solve request; ValueError if malformed."""
+        engine = request.get("engine", "dp")
+        if engine not in batch.ENGINES:
+            raise ValueError(f"unknown engine {engine!r}; choose from {', '.join(batch.ENGINES)}")
+        rows, cols = request.get("rows", 3), request.get("cols", 3)
+        if type(rows) is not int or type(cols) is not int or (rows, cols) not in self.sizes:
+            raise ValueError(f"{rows}x{cols} boards are not served")
+        if engine == "dp" and (rows, cols) != (3, 3):
+            raise ValueError("the dp engine solves 3x3 boards only")
+        tiles = request.get("board")
+        if (not isinstance(tiles, list) or not all(type(v) is int for v in tiles)
+                or sorted(tiles) != list(range(rows * cols))):
+            raise ValueError(f"board must list the tiles 0..{rows * cols - 1} once each")
+        seconds = request.get("deadline", self.deadline)
+        if type(seconds) not in (int, float) or not math.isfinite(seconds) or seconds <= 0:
+            raise ValueError("deadline must be a positive number of seconds")
+        return engine, tiles, rows, cols, min(seconds, self.deadline)
+
+    async def solve(self, request, send):
+        rid = request.get("id")
+        try:
+            engine, tiles, rows, cols, seconds = self.parse(request)
+        except ValueError as e:
+            await send({"id": rid, "error": str(e)})
+            return
+
+        deadline = time.time() + seconds
+        try:
+            path, pid, stats = await asyncio.wait_for(self._run(engine, tiles, rows, cols, deadline),
+                                                      seconds)
+        except (asyncio.TimeoutError, TimeoutError):
+            await send({"id": rid, "error": "deadline exceeded"})
+            return
+        except BrokenProcessPool:
+            await send({"id": rid, "error": "solver process failed"})
+            return
+        if stats is not None:
+            self.cache_stats[pid] = stats
+
+        for state in path:
+            await send({"id": rid, "move": state})
+        await send({"id": rid, "done": True, "moves": len(path) - 1 if path else -1})
+
+    async def _run(self, engine, tiles, rows, cols, deadline):
+        # The slot is released when the pool is done with the job, not when
+        # this request stops waiting for it: a timed-out or cancelled solve
+        # that is already running keeps its worker until its deadline.
+        await self.limit.acquire()
+        loop = asyncio.get_running_loop()
+
+        def release(future):
+            try:
+                loop.call_soon_threadsafe(self.limit.release)
+            except RuntimeError:
+                pass    # the event loop is already closed
+
+        try:
+            future = self.pool.submit(_solve, engine, tiles, rows, cols, deadline)
+        except BaseException:
+            self.limit.release()
+            raise
+        future.add_done_callback(release)
+        return await asyncio.wrap_future(future)
+
+    async def handle(self, reader, writer):
+        """Serve one connection until the client closes it."""
+        tasks = {}      # request id -> task
+        slots = asyncio.Semaphore(MAX_IN_FLIGHT)
+        lock = asyncio.Lock()
+
+        async def send(message):
+            writer.write(json.dumps(message).encode() + b"\n")
+            async with lock:
+                await writer.drain()
+
+        def finished(rid, task):
+            if tasks.get(rid) is task:
+                del tasks[rid]
+            slots.release()
+            if not task.cancelled() and task.exception() is not None:
+                writer.close()      # the client went away mid-reply
+
+        try:
+            while True:
+                await slots.acquire()
+                line = await reader.readline()
+                if not line:
+                    break
+                try:
+                    request = json.loads(line)
+                    if not isinstance(request, dict):
+                        raise ValueError
+                    rid = request.get("cancel", request.get("id"))
+                    if not valid_id(rid):
+                        raise ValueError
+                except ValueError:
+                    slots.release()
+                    await send({"id": None, "error": "expected a JSON object with a string or number id"})
+                    continue
+
+                if "cancel" in request:
+                    slots.release()
+                    task = tasks.pop(rid, None)
+                    if task is None:
+                        await send({"id": rid, "error": "no such request"})
+                    else:
+                        task.cancel()
+                        await send({"id": rid, "cancelled": True})
+                elif request.get("stats"):
+                    slots.release()
+                    await send({"id": rid, "stats": self.stats()})
+                elif rid in tasks:
+                    slots.release()
+                    await send({"id": rid, "error": "a request with this id is already open"})
+                else:
+                    task = asyncio.ensure_future(self.solve(request, send))
+                    tasks[rid] = task
+                    task.add_done_callback(lambda t, rid=rid: finished(rid, t))
+        except (ConnectionError, ValueError):
+            pass    # reset by the client, or a line over the stream limit
+        finally:
+            for task in tasks.values():
+                task.cancel()
+            await asyncio.gather(*tasks.values(), return_exceptions=True)
+            writer.close()
+
+
+def valid_id(rid):
+    """Whether ``rid`` can name a request: a string or a finite number."""
+    if type(rid) is float:
+        return math.isfinite(rid)
+    return type(rid) in (str, int)
+
+
+async def serve(service, host=HOST, port=PORT, path=None, ready=None):
+    """Run ``service`` on a TCP port, or on the Unix socket ``path``, until cancelled.
+
+    ``ready(server)`` is called once the socket is listening.
+    """
+    await service.start()
+    try:
+        if path is not None:
+            server = await asyncio.start_unix_server(service.handle, path)
+        else:
+            server = await asyncio.start_server(service.handle, host, port)
+        async with server:
+            if ready is not None:
+                ready(server)
+            await server.serve_forever()
+    finally:
+        service.close()
+
+
+# ------------------ COMMAND LINE ------------------
+
+def parse_size(text):
+    try:
+        rows, cols = (int(v) for v in text.lower().split("x"))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected ROWSxCOLS, not {text!r}") from None
+    return rows, cols
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve puzzle solves over a local socket.")
+    parser.add_argument("--host", default=HOST)
+    parser.add_argument("--port", type=int, default=PORT)
+    parser.add_argument("--unix", metavar="PATH", help="listen on a Unix socket instead of TCP")
+    parser.add_argument("--workers", type=int, default=None, help="solver processes (default: CPU count)")
+    parser.add_argument("--max-concurrent", type=int, default=None,
+                        help="solves running or queued in the pool at once (default: 2 per worker)")
+    parser.add_argument("--deadline", type=float, default=DEADLINE,
+                        help="longest deadline, in seconds, a request may ask for")
+    parser.add_argument("--size", type=parse_size, action="append", metavar="ROWSxCOLS",
+                        help="board size to serve, repeatable (default: 3x3)")
+    parser.add_argument("--cache-size", type=int, default=solution_cache.MAXSIZE,
+                        help="solutions cached per worker (0: no cache)")
+    args = parser.parse_args(argv)
+
+    service = SolveService(args.workers, args.max_concurrent, args.deadline, args.size or [(3, 3)],
+                           args.cache_size)
+
+    def ready(server):
+        where = args.unix or f"{args.host}:{args.port}"
+        print(f"listening on {where}", file=sys.stderr)
+
+    try:
+        asyncio.run(serve(service, args.host, args.port, args.unix, ready))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
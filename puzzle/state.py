@@ -0,0 +1,268 @@
+"""Packed integer encoding of puzzle boards.
+
+A board is stored as a single int with ``bits`` bits per cell (4 for
+boards up to 4x4): the tile in cell ``i`` (row-major, 0 = blank) lives in
+bits ``bits*i .. bits*i+bits-1``. Packed boards hash and compare as plain
+ints, and sliding the blank is an O(1) pair of xors, so solvers can keep
+visited sets and parent maps without allocating a list, tuple or string
+per state.
+
+:class:`Board` holds the geometry of one ``rows x cols`` puzzle. The
+module-level names are the 3x3 board's, which every solver uses unless it
+is given another board.
+"""
+
+from functools import lru_cache
+from math import factorial
+
+DIRS = [(-1, 0), (1, 0), (0, -1), (0, 1)]
+
+
+class Board:
+    """Geometry and packed-state operations for a ``rows x cols`` puzzle."""
+
+    def __init__(self, rows=3, cols=3):
+        if rows < 2 or cols < 2:
+            raise ValueError("boards must be at least 2x2")
+
+        self.rows = rows
+        self.cols = cols
+        self.size = rows * cols
+        self.bits = max(4, (self.size - 1).bit_length())
+        self.mask = (1 << self.bits) - 1
+
+        self.goal_tiles = tuple(range(1, self.size)) + (0,)
+        self.goal = self.pack(self.goal_tiles)
+        self.moves = self.moves_for(DIRS)
+
+        # permutation rank: see rank()
+        self.tiles = self.size - 1
+        self.fact = [factorial(k) for k in range(self.size + 1)]
+        self.half = self.fact[self.tiles] // 2
+        self.num_states = self.size * self.half
+
+    def __repr__(self):
+        return f"Board({self.rows}, {self.cols})"
+
+    def moves_for(self, dirs):
+        """Per blank position, the cells the blank can slide to, in ``dirs`` order."""
+        table = []
+        for i in range(self.size):
+            r, c = divmod(i, self.cols)
+            targets = []
+            for dr, dc in dirs:
+                nr, nc = r + dr, c + dc
+                if 0 <= nr < self.rows and 0 <= nc < self.cols:
+                    targets.append(nr * self.cols + nc)
+            table.append(tuple(targets))
+        return tuple(table)
+
+    # ------------------ CONVERSIONS ------------------
+
+    def pack(self, tiles):
+        """Pack a flat sequence of tiles (e.g. a 9-tuple) into an int."""
+        code = 0
+        for i, v in enumerate(tiles):
+            code |= v << (self.bits * i)
+        return code
+
+    def unpack(self, code):
+        """Inverse of :meth:`pack`, returning a tuple."""
+        bits, mask = self.bits, self.mask
+        return tuple((code >> (bits * i)) & mask for i in range(self.size))
+
+    def from_grid(self, grid):
+        """Pack a nested-list board such as ``[[1, 2, 3], [4, 5, 6], [7, 8, 0]]``."""
+        return self.pack(v for row in grid for v in row)
+
+    def to_grid(self, code):
+        """Inverse of :meth:`from_grid`, returning a fresh nested list."""
+        flat = self.unpack(code)
+        cols = self.cols
+        return [list(flat[r * cols:(r + 1) * cols]) for r in range(self.rows)]
+
+    # ------------------ MOVES ------------------
+
+    def tile_at(self, code, i):
+        return (code >> (self.bits * i)) & self.mask
+
+    def blank_index(self, code):
+        bits, mask = self.bits, self.mask
+        for i in range(self.size):
+            if not (code >> (bits * i)) & mask:
+                return i
+        raise ValueError("board has no blank")
+
+    def move_blank(self, code, blank, target):
+        """Slide the tile at ``target`` into the blank at ``blank``."""
+        tile = (code >> (self.bits * target)) & self.mask
+        return code ^ (tile << (self.bits * target)) ^ (tile << (self.bits * blank))
+
+    def neighbors(self, code, blank, moves=None):
+        """Yield ``(child, child_blank)`` for every legal slide."""
+        bits, mask = self.bits, self.mask
+        for target in (moves or self.moves)[blank]:
+            tile = (code >> (bits * target)) & mask
+            yield code ^ (tile << (bits * target)) ^ (tile << (bits * blank)), target
+
+    # ------------------ PERMUTATION RANK ------------------
+
+    # Reachable boards are numbered 0 .. num_states-1 as
+    #     blank_cell * half + lehmer_rank(tiles) // 2
+    # where ``tiles`` are the non-blank tiles in reading order. Lexicographic
+    # ranks 2k and 2k+1 differ only by swapping the last two tiles, so
+    # exactly one of each pair has the inversion parity that reachable
+    # boards with the blank in that cell must have, which makes ``// 2`` a
+    # perfect hash.
+
+    def required_parity(self, blank):
+        """Tile inversion parity of every reachable board with the blank at ``blank``.
+
+        On odd widths a vertical slide jumps a tile over an even number of
+        others, so the parity never changes. On even widths it flips with
+        every row the blank moves away from the goal row.
+        """
+        if self.cols % 2:
+            return 0
+        return (self.rows - 1 - blank // self.cols) % 2
+
+    def parity_class(self, code):
+        """0 for boards in the goal's half of the state space, 1 for the other half.
+
+        A slide is a transposition that also moves the blank one cell, so
+        the parity of the cell permutation (blank included) plus the
+        blank's Manhattan distance from its goal cell never changes. The
+        permutation parity comes from its cycle count, which keeps the test
+        O(size) instead of counting inversions. ValueError if ``code`` is
+        not a permutation of the board's tiles.
+        """
+        bits, mask, size = self.bits, self.mask, self.size
+        if code >> (bits * size):
+            raise ValueError("not a board of this size")
+        target = [0] * size
+        seen = 0
+        blank = -1
+        for i in range(size):
+            v = (code >> (bits * i)) & mask
+            if v >= size or seen >> v & 1:
+                raise ValueError("not a board of this size")
+            seen |= 1 << v
+            if v:
+                target[i] = v - 1
+            else:
+                target[i] = size - 1
+                blank = i
+
+        swaps = 0
+        visited = [False] * size
+        for i in range(size):
+            j = i
+            length = 0
+            while not visited[j]:
+                visited[j] = True
+                j = target[j]
+                length += 1
+            swaps += max(length - 1, 0)
+
+        distance = (self.rows - 1 - blank // self.cols) + (self.cols - 1 - blank % self.cols)
+        return (swaps + distance) % 2
+
+    def is_solvable(self, code, goal=None):
+        """Whether ``code`` can reach ``goal`` (the board's goal by default), in O(size)."""
+        try:
+            return self.parity_class(code) == (0 if goal is None else self.parity_class(goal))
+        except ValueError:
+            return False
+
+    def rank(self, code):
+        """Dense index of a reachable board; ValueError for unreachable ones."""
+        bits, mask, fact = self.bits, self.mask, self.fact
+        blank = -1
+        used = 0
+        r = 0
+        parity = 0
+        k = self.tiles - 1
+        for i in range(self.size):
+            v = (code >> (bits * i)) & mask
+            if not v:
+                blank = i
+                continue
+            smaller = v - 1 - (used & ((1 << v) - 1)).bit_count()
+            r += smaller * fact[k]
+            parity += smaller
+            used |= 1 << v
+            k -= 1
+        if parity % 2 != self.required_parity(blank):
+            raise ValueError("board is not reachable from the goal")
+        return blank * self.half + (r >> 1)
+
+    def unrank(self, index):
+        """Inverse of :meth:`rank`."""
+        blank, r = divmod(index, self.half)
+        r <<= 1
+        pool = list(range(1, self.size))
+        tiles = []
+        parity = 0
+        for k in range(self.tiles - 1, -1, -1):
+            digit, r = divmod(r, self.fact[k])
+            parity += digit
+            tiles.append(pool.pop(digit))
+        if parity % 2 != self.required_parity(blank):
+            tiles[-1], tiles[-2] = tiles[-2], tiles[-1]
+        tiles.insert(blank, 0)
+        return self.pack(tiles)
+
+
+def check_exhaustive(board, solver):
+    """Refuse boards too large for a search that may visit every state.
+
+    Bidirectional BFS and plain backtracking keep each state they reach,
+    which stays within memory and time up to the 3x3 board's 181,440
+    states; ValueError for boards with more.
+    """
+    if board.num_states > MAX_EXHAUSTIVE_STATES:
+        raise ValueError(
+            f"{solver} is limited to boards of at most {MAX_EXHAUSTIVE_STATES:,} states "
+            f"({board.rows}x{board.cols} has {board.num_states:,})"
+        )
+
+
+@lru_cache(maxsize=None)
+def get_board(rows, cols):
+    """The shared :class:`Board` for ``rows x cols`` (tables are cached per board)."""
+    return DEFAULT if (rows, cols) == (3, 3) else Board(rows, cols)
+
+
+# ------------------ DEFAULT 3x3 BOARD ------------------
+
+DEFAULT = Board(3, 3)
+
+ROWS = DEFAULT.rows
+COLS = DEFAULT.cols
+SIZE = DEFAULT.size
+BITS = DEFAULT.bits
+MASK = DEFAULT.mask
+
+GOAL_TILES = DEFAULT.goal_tiles
+GOAL = DEFAULT.goal
+MOVES = DEFAULT.moves
+
+TILES = DEFAULT.tiles
+FACT = DEFAULT.fact
+HALF = DEFAULT.half
+NUM_STATES = DEFAULT.num_states
+MAX_EXHAUSTIVE_STATES = NUM_STATES
+
+moves_for = DEFAULT.moves_for
+pack = DEFAULT.pack
+unpack = DEFAULT.unpack
+from_grid = DEFAULT.from_grid
+to_grid = DEFAULT.to_grid
+tile_at = DEFAULT.tile_at
+blank_index = DEFAULT.blank_index
+move_blank = DEFAULT.move_blank
+neighbors = DEFAULT.neighbors
+parity_class = DEFAULT.parity_class
+is_solvable = DEFAULT.is_solvable
+rank = DEFAULT.rank
+unrank = DEFAULT.unrank
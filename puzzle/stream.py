@@ -0,0 +1,43 @@
+"""Events yielded by the solvers' generator modes.
+
+Every engine has an ``iter_*`` generator next to its list-returning
+function (``iter_greedy``, ``iter_astar``/``iter_dnc``, ``iter_path``/
+``iter_bidirectional``, ``iter_backtrack``/``iter_ida``). They yield
+``(kind, state)`` pairs, ``state`` a flat tuple:
+
+* ``(EXPLORE, state)`` for every expanded state, only when called with
+  ``explore=True``;
+* ``(MOVE, state)`` for every state of the solution, starting with the
+  start board and ending with the goal, as soon as the engine knows it.
+
+A board that cannot be solved yields no moves. Consumers may stop early:
+closing the generator abandons the search. The generators behind
+:data:`puzzle.batch.ENGINES` also take a ``cancel`` object and end as soon
+as ``cancel.is_set()`` is true, checked once per expanded state, so a
+consumer that cannot interrupt them (one that only collects the moves)
+can still bound the search; the moves yielded by then are not a solution.
+"""
+
+EXPLORE = "explore"
+MOVE = "move"
+
+
+def collect(events, explored_states=None):
+    """Run ``events`` to the end and return the solution as a list.
+
+    EXPLORE states are appended to ``explored_states`` (any trace sink).
+    """
+    path = []
+    for kind, state in events:
+        if kind is MOVE:
+            path.append(state)
+        else:
+            explored_states.append(state)
+    return path
+
+
+def moves(events):
+    """Only the solution states of ``events``."""
+    for kind, state in events:
+        if kind is MOVE:
+            yield state
@@ -0,0 +1,82 @@
+"""Versioned binary files for rank-indexed tables (see :func:`state.rank`).
+
+A file is a fixed header followed by the raw table bytes::
+
+    magic    4s  b"PZTB"
+    version  H   FORMAT_VERSION
+    kind     H   what the bytes mean (DISTANCE, PATTERN)
+    length   I   number of table bytes
+    goal     16s digest of the packed goal board the table was built for
+    crc32    I   zlib.crc32 of the table bytes
+
+The goal is stored as a fixed-width BLAKE2b digest (see :func:`goal_digest`)
+because a packed board outgrows 64 bits past 16 cells.
+
+Tables are loaded through a read-only ``mmap``, so loading copies nothing
+and every process on the host shares the same page-cache pages.
+"""
+
+import hashlib
+import mmap
+import os
+import struct
+import zlib
+
+MAGIC = b"PZTB"
+FORMAT_VERSION = 2
+HEADER = struct.Struct("<4sHHI16sI")
+
+# table kinds
+DISTANCE = 1
+PATTERN = 2
+
+
+def goal_digest(goal):
+    """16-byte digest of a packed goal board of any size."""
+    data = goal.to_bytes((goal.bit_length() + 7) // 8, "little")
+    return hashlib.blake2b(data, digest_size=16).digest()
+
+
+def save(path, kind, goal, table):
+    """Atomically write ``table`` to ``path``."""
+    header = HEADER.pack(MAGIC, FORMAT_VERSION, kind, len(table), goal_digest(goal),
+                         zlib.crc32(table))
+    tmp = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp, "wb") as f:
+            f.write(header)
+            f.write(table)
+        os.replace(tmp, path)
+    finally:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+
+
+def load(path, kind, goal, length):
+    """Map ``path`` read-only and return a memoryview of its table bytes.
+
+    Returns None when the file is missing, truncated, from another format
+    version or table kind, built for another goal, or fails its checksum;
+    callers rebuild the table in that case.
+    """
+    try:
+        with open(path, "rb") as f:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError):
+        return None
+
+    if len(mm) != HEADER.size + length:
+        mm.close()
+        return None
+
+    magic, version, file_kind, file_length, file_goal, crc = \
+        HEADER.unpack_from(mm)
+    table = memoryview(mm)[HEADER.size:]
+    if (magic != MAGIC or version != FORMAT_VERSION or file_kind != kind
+            or file_length != length or file_goal != goal_digest(goal)
+            or zlib.crc32(table) != crc):
+        table.release()
+        mm.close()
+        return None
+
+    return table
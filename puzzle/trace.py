@@ -0,0 +1,134 @@
+"""Sinks for the explored-state trace of a solver.
+
+Every solver takes an optional ``explored_states`` argument and calls its
+``append`` with each expanded state as a flat tuple. A plain list keeps
+everything; the sinks here bound the memory a long search needs:
+
+* :class:`CountTrace`   keeps nothing, only counts,
+* :class:`RingTrace`    keeps the last ``size`` states,
+* :class:`SampledTrace` keeps every ``every``-th state,
+* :class:`FileTrace`    keeps all states, packed into a temporary file and
+  read back lazily.
+
+All of them have ``total`` (states appended), ``len()`` (states kept) and
+iterate over the kept states in order, so a visualization can replay any
+of them.
+"""
+
+import tempfile
+from collections import deque
+
+from puzzle import state as ps
+
+
+class CountTrace:
+    """Counts appended states without keeping any."""
+
+    def __init__(self):
+        self.total = 0
+
+    def append(self, state):
+        self.total += 1
+
+    def __len__(self):
+        return 0
+
+    def __iter__(self):
+        return iter(())
+
+
+class RingTrace:
+    """The last ``size`` appended states."""
+
+    def __init__(self, size):
+        self.states = deque(maxlen=size)
+        self.total = 0
+
+    def append(self, state):
+        self.states.append(state)
+        self.total += 1
+
+    def __len__(self):
+        return len(self.states)
+
+    def __iter__(self):
+        return iter(self.states)
+
+
+class SampledTrace:
+    """Every ``every``-th appended state, starting with the first."""
+
+    def __init__(self, every):
+        if every < 1:
+            raise ValueError("every must be at least 1")
+        self.every = every
+        self.states = []
+        self.total = 0
+
+    def append(self, state):
+        if self.total % self.every == 0:
+            self.states.append(state)
+        self.total += 1
+
+    def __len__(self):
+        return len(self.states)
+
+    def __iter__(self):
+        return iter(self.states)
+
+
+class FileTrace:
+    """Every appended state, spilled to an anonymous temporary file.
+
+    States are stored packed (:meth:`Board.pack <puzzle.state.Board.pack>`)
+    in fixed-width little-endian records, 5 bytes each on the 3x3 board,
+    and written in blocks. Iterating reads the file back a block at a
+    time, so neither side holds more than one block in memory. The file
+    is deleted by :meth:`close` (or when the trace is garbage collected).
+    """
+
+    BLOCK = 1 << 16     # bytes buffered before a write, and read at a time
+
+    def __init__(self, board=ps.DEFAULT):
+        self.board = board
+        self.width = (board.bits * board.size + 7) // 8
+        self.file = tempfile.TemporaryFile(prefix="puzzle-trace-")
+        self.total = 0
+        self._buffer = bytearray()
+
+    def append(self, state):
+        self._buffer += self.board.pack(state).to_bytes(self.width, "little")
+        self.total += 1
+        if len(self._buffer) >= self.BLOCK:
+            self.flush()
+
+    def flush(self):
+        if self._buffer:
+            self.file.seek(0, 2)
+            self.file.write(self._buffer)
+            self._buffer.clear()
+
+    def __len__(self):
+        return self.total
+
+    def __iter__(self):
+        self.flush()
+        width, unpack = self.width, self.board.unpack
+        end = self.total * width
+        block = self.BLOCK - self.BLOCK % width
+        offset = 0
+        while offset < end:
+            self.file.seek(offset)
+            data = self.file.read(min(block, end - offset))
+            offset += len(data)
+            for i in range(0, len(data), width):
+                yield unpack(int.from_bytes(data[i:i + width], "little"))
+
+    def close(self):
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,110 @@
+"""NumPy batch versions of the packed-board helpers used by the BFS.
+
+Functions here take a 1-D ``uint64`` array of packed boards (see
+:mod:`puzzle.state`) and work on the whole array at once, so the DP
+table's breadth-first sweep handles a frontier layer per call. They are
+fixed to the default 3x3 board, the only board whose full state space is
+swept. NumPy is only needed by this module.
+"""
+
+import numpy as np
+
+from puzzle import state as ps
+
+_MASK = np.uint64(ps.MASK)
+
+
+def as_codes(codes):
+    return np.asarray(codes, dtype=np.uint64)
+
+
+# ------------------ RANK / MOVES ------------------
+
+# _SMALLER[used, v] -> tiles below v that are not in the bitmask ``used``
+_SMALLER = np.array(
+    [[v - 1 - bin(used & ((1 << v) - 2)).count("1") if v else 0
+      for v in range(ps.MASK + 1)]
+     for used in range(1 << ps.SIZE)],
+    dtype=np.int64,
+)
+# _FACTS[k] -> weight of the k-th Lehmer digit (0 past the last tile)
+_FACTS = np.array([ps.FACT[ps.TILES - 1 - k] for k in range(ps.TILES)] + [0],
+                  dtype=np.int64)
+
+
+def rank(codes):
+    """Batch :func:`puzzle.state.rank` (boards must be reachable)."""
+    codes = as_codes(codes)
+    n = len(codes)
+    used = np.zeros(n, dtype=np.intp)       # bitmask of tiles seen so far
+    place = np.zeros(n, dtype=np.intp)      # tiles seen so far
+    blank = np.zeros(n, dtype=np.int64)
+    lehmer = np.zeros(n, dtype=np.int64)
+
+    for i in range(ps.SIZE):
+        v = ((codes >> np.uint64(ps.BITS * i)) & _MASK).astype(np.intp)
+        lehmer += _SMALLER[used, v] * _FACTS[place]
+        tile = v != 0
+        used |= np.left_shift(1, v) & ~1
+        place += tile
+        blank[~tile] = i
+
+    return blank * ps.HALF + (lehmer >> 1)
+
+
+def neighbors(codes, blanks):
+    """All children of every board: returns (child codes, child blanks)."""
+    codes = as_codes(codes)
+    blanks = np.asarray(blanks, dtype=np.int64)
+    rows, cols = np.divmod(blanks, ps.COLS)
+    bits = np.uint64(ps.BITS)
+
+    out_codes, out_blanks = [], []
+    for dr, dc in ps.DIRS:
+        ok = (rows + dr >= 0) & (rows + dr < ps.ROWS) & (cols + dc >= 0) & (cols + dc < ps.COLS)
+        src, blank = codes[ok], blanks[ok]
+        target = blank + dr * ps.COLS + dc
+        t_shift = target.astype(np.uint64) * bits
+        b_shift = blank.astype(np.uint64) * bits
+        tile = (src >> t_shift) & _MASK
+        out_codes.append(src ^ (tile << t_shift) ^ (tile << b_shift))
+        out_blanks.append(target)
+    return np.concatenate(out_codes), np.concatenate(out_blanks)
+
+
+# ------------------ DISTANCE TABLE ------------------
+
+
+def bfs_table(goal, progress=None, cancel=None, unseen=0xFF):
+    """Frontier-at-a-time BFS over every reachable board.
+
+    Returns a bytearray indexed by rank holding the distance to ``goal``
+    (``unseen`` for boards never reached), the same table as the scalar
+    BFS in dynamicprogram.py; progress and cancel behave the same way.
+    """
+    dist = np.full(ps.NUM_STATES, unseen, dtype=np.uint8)
+    frontier = np.array([goal], dtype=np.uint64)
+    blanks = np.array([ps.blank_index(goal)], dtype=np.int64)
+    dist[rank(frontier)] = 0
+    depth = 0
+    discovered = 1
+
+    while len(frontier):
+        if cancel is not None and cancel.is_set():
+            return None
+
+        depth += 1
+        children, child_blanks = neighbors(frontier, blanks)
+        ranks = rank(children)
+
+        fresh = dist[ranks] == unseen
+        ranks, first = np.unique(ranks[fresh], return_index=True)
+        frontier = children[fresh][first]
+        blanks = child_blanks[fresh][first]
+        dist[ranks] = depth
+        discovered += len(frontier)
+
+        if progress is not None and len(frontier):
+            progress(discovered, depth)
+
+    return bytearray(dist.tobytes())
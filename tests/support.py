@@ -0,0 +1,56 @@
+"""Helpers shared by the test modules."""
+
+import os
+import tempfile
+from unittest import mock
+
+from puzzle import dp
+from puzzle import patterndb
+from puzzle import state as ps
+
+# The only two 3x3 boards 31 moves from the goal.
+HARDEST = ((8, 6, 7, 2, 5, 4, 3, 0, 1),
+           (6, 4, 7, 8, 5, 0, 3, 2, 1))
+
+
+def scramble(moves, rng, board=ps.DEFAULT):
+    """The packed board ``moves`` random slides from the goal."""
+    code = board.goal
+    blank = board.blank_index(code)
+    for _ in range(moves):
+        target = rng.choice(board.moves[blank])
+        code = board.move_blank(code, blank, target)
+        blank = target
+    return code
+
+
+def swap_tiles(code, board=ps.DEFAULT):
+    """``code`` with its first two tiles exchanged, in the other parity class."""
+    tiles = list(board.unpack(code))
+    a, b = [i for i, v in enumerate(tiles) if v][:2]
+    tiles[a], tiles[b] = tiles[b], tiles[a]
+    return board.pack(tiles)
+
+
+def assert_path(test, path, start, board=ps.DEFAULT):
+    """Fail ``test`` unless ``path`` slides from ``start`` to the goal one move at a time."""
+    test.assertEqual(path[0], start)
+    test.assertEqual(path[-1], board.goal_tiles)
+    for a, b in zip(path, path[1:]):
+        code = board.pack(a)
+        test.assertIn(board.pack(b), [n for n, _ in board.neighbors(code, board.blank_index(code))])
+
+
+def use_temp_data_dir(test_class):
+    """Keep the table files of ``test_class`` in a temporary directory.
+
+    Call from ``setUpClass``; the directory is removed after the class.
+    """
+    directory = tempfile.TemporaryDirectory()
+    test_class.addClassCleanup(directory.cleanup)
+    table_file = os.path.join(directory.name, "dp_table.bin")
+    for patcher in (mock.patch.object(patterndb, "DATA_DIR", directory.name),
+                    mock.patch.object(dp, "DP_TABLE_FILE", table_file)):
+        patcher.start()
+        test_class.addClassCleanup(patcher.stop)
+    return directory.name
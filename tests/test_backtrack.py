@@ -0,0 +1,128 @@
+import random
+import unittest
+
+from puzzle import backtrack
+from puzzle import dp
+from puzzle import metrics
+from puzzle import state as ps
+from tests.support import HARDEST, assert_path, scramble, use_temp_data_dir
+
+
+def recursive_backtrack(current, goal, visited, path, explored_states, depth=0, max_depth=100):
+    # The recursive formulation that BacktrackSearch replaces, on tuples.
+    explored_states.append(current)
+    if current == goal:
+        return path + [current]
+    if depth > max_depth:
+        return None
+    visited.add(current)
+    for neighbor in backtrack.generate_neighbors(current):
+        if neighbor not in visited:
+            result = recursive_backtrack(neighbor, goal, visited, path + [current],
+                                         explored_states, depth + 1, max_depth)
+            if result is not None:
+                return result
+    return None
+
+
+class BacktrackTest(unittest.TestCase):
+
+    def boards(self):
+        rng = random.Random(9)
+        return [ps.unpack(scramble(depth, rng)) for depth in (2, 6, 12, 25)]
+
+    def test_same_trace_and_result_as_the_recursion(self):
+        for max_depth in (5, 20, 100):
+            for start in self.boards():
+                expected, expected_visited = [], set()
+                result = recursive_backtrack(start, ps.GOAL_TILES, expected_visited, [], expected,
+                                             max_depth=max_depth)
+                explored, visited = [], set()
+                self.assertEqual(backtrack.pure_backtrack_simple(
+                    start, ps.GOAL_TILES, visited, [], explored, max_depth=max_depth), result)
+                self.assertEqual(explored, expected)
+                self.assertEqual(visited, {ps.pack(s) for s in expected_visited})
+
+    def test_resumed_search_matches_a_full_run(self):
+        start = self.boards()[-1]
+        full = []
+        expected = backtrack.pure_backtrack_simple(start, ps.GOAL_TILES, set(), [], full)
+        explored = []
+        search = backtrack.BacktrackSearch(start, ps.GOAL_TILES, set(), [], explored)
+        slices = 1
+        while not search.run(1000):
+            slices += 1
+        self.assertGreater(slices, 1)
+        self.assertEqual(search.result, expected)
+        self.assertEqual(explored, full)
+
+
+    def test_unsolvable_board_explores_nothing(self):
+        explored = []
+        start = (2, 1, 3, 4, 5, 6, 7, 8, 0)
+        self.assertIsNone(backtrack.pure_backtrack_simple(start, ps.GOAL_TILES, set(), [],
+                                                             explored))
+        self.assertEqual(explored, [])
+
+    def test_refuses_boards_larger_than_3x3(self):
+        board = ps.get_board(4, 4)
+        with self.assertRaises(ValueError):
+            backtrack.pure_backtrack_simple(board.goal_tiles, board.goal_tiles, set(), [], [],
+                                            board=board)
+
+
+class IdaStarTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        use_temp_data_dir(cls)
+        cls.table = dp.bfs_table(ps.GOAL)
+
+    def test_paths_are_as_short_as_the_table_says(self):
+        rng = random.Random(5)
+        boards = [ps.unpack(scramble(depth, rng)) for depth in (1, 5, 10, 20, 40) for _ in range(4)]
+        for start in boards + [HARDEST[0]]:
+            path = backtrack.ida_star(start)
+            assert_path(self, path, start)
+            self.assertEqual(len(path) - 1, self.table[ps.rank(ps.pack(start))])
+
+    def test_other_boards(self):
+        rng = random.Random(8)
+        for rows, cols in ((2, 4), (3, 2)):
+            board = ps.get_board(rows, cols)
+            table = dp.bfs_table(board.goal, board=board)
+            for _ in range(10):
+                code = scramble(rng.randrange(60), rng, board)
+                start = board.unpack(code)
+                path = backtrack.ida_star(start, board=board)
+                assert_path(self, path, start, board)
+                self.assertEqual(len(path) - 1, table[board.rank(code)])
+
+    def test_explored_states_start_with_the_start(self):
+        explored = []
+        start = (1, 2, 3, 4, 5, 6, 0, 7, 8)
+        self.assertEqual(len(backtrack.ida_star(start, explored)), 3)
+        self.assertEqual(explored[0], start)
+        self.assertEqual(explored[-1], ps.GOAL_TILES)
+
+    def test_goal_and_unreachable_boards(self):
+        self.assertEqual(backtrack.ida_star(ps.GOAL_TILES), [ps.GOAL_TILES])
+        explored = []
+        self.assertIsNone(backtrack.ida_star((2, 1, 3, 4, 5, 6, 7, 8, 0), explored))
+        self.assertEqual(explored, [])
+
+    def test_metrics_count_every_expansion(self):
+        registry = metrics.enable()
+        self.addCleanup(metrics.disable)
+        explored = []
+        path = backtrack.ida_star(HARDEST[0], explored)
+        totals = registry.totals["ida"]
+        self.assertEqual(totals["solves"], 1)
+        self.assertEqual(totals["expanded"], len(explored))
+        self.assertEqual(totals["frontier_max"], len(path))
+        self.assertEqual(totals["evaluations"], totals["generated"] + 1)
+        self.assertGreater(totals["duplicates"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
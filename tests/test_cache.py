@@ -0,0 +1,101 @@
+import unittest
+
+from puzzle import cache
+from puzzle import state as ps
+
+
+def path_from(start, blanks):
+    # the states reached by sliding the blank through the cells in blanks
+    code = ps.pack(start)
+    path = [start]
+    for target in blanks:
+        code = ps.move_blank(code, ps.blank_index(code), target)
+        path.append(ps.unpack(code))
+    return path
+
+
+SHORT = path_from((1, 2, 3, 4, 5, 6, 0, 7, 8), [7, 8])     # two moves to the goal
+OTHER = path_from((1, 2, 3, 4, 0, 6, 7, 5, 8), [7, 8])
+
+
+class SolutionCacheTest(unittest.TestCase):
+
+    def test_miss_then_hit(self):
+        c = cache.SolutionCache()
+        self.assertIsNone(c.get("dnc", SHORT[0]))
+        c.put("dnc", SHORT)
+        self.assertEqual(c.get("dnc", SHORT[0]), SHORT)
+        self.assertEqual(c.stats()["hits"], 1)
+        self.assertEqual(c.stats()["misses"], 1)
+        self.assertEqual(c.stats()["hit_rate"], 0.5)
+
+    def test_keys_include_engine_and_board(self):
+        c = cache.SolutionCache()
+        c.put("dnc", SHORT)
+        self.assertIsNone(c.get("greedy", SHORT[0]))
+        board = ps.get_board(2, 4)
+        self.assertIsNone(c.get("dnc", (1, 2, 3, 4, 5, 6, 7, 0), board))
+
+    def test_optimal_engines_cache_every_suffix(self):
+        c = cache.SolutionCache()
+        c.put("dp", SHORT)
+        self.assertEqual(len(c), len(SHORT))
+        for i, state in enumerate(SHORT):
+            self.assertEqual(c.get("dp", state), SHORT[i:])
+
+    def test_other_engines_cache_only_the_start(self):
+        for engine in ("greedy", "dnc"):
+            c = cache.SolutionCache()
+            c.put(engine, SHORT)
+            self.assertEqual(len(c), 1)
+            self.assertIsNone(c.get(engine, SHORT[1]))
+
+    def test_unsolvable_results_are_not_cached(self):
+        c = cache.SolutionCache()
+        c.put("dp", [])
+        self.assertEqual(len(c), 0)
+
+    def test_least_recently_used_is_evicted(self):
+        c = cache.SolutionCache(maxsize=2)
+        c.put("dnc", SHORT)
+        c.put("dnc", OTHER)
+        c.get("dnc", SHORT[0])                  # SHORT is now the most recent
+        c.put("greedy", SHORT)
+        self.assertIsNone(c.get("dnc", OTHER[0]))
+        self.assertEqual(c.get("dnc", SHORT[0]), SHORT)
+        self.assertEqual(c.stats()["evictions"], 1)
+
+    def test_suffixes_are_evicted_before_the_start(self):
+        c = cache.SolutionCache(maxsize=2)
+        c.put("dp", SHORT)
+        self.assertEqual(c.get("dp", SHORT[0]), SHORT)
+        self.assertEqual(c.get("dp", SHORT[1]), SHORT[1:])
+        self.assertIsNone(c.get("dp", SHORT[2]))
+        self.assertEqual(c.stats()["evictions"], 1)
+
+    def test_clear(self):
+        c = cache.SolutionCache()
+        c.put("dp", SHORT)
+        c.get("dp", SHORT[0])
+        c.clear()
+        self.assertEqual(c.stats(), cache.SolutionCache().stats())
+
+    def test_maxsize_must_be_positive(self):
+        with self.assertRaises(ValueError):
+            cache.SolutionCache(0)
+
+    def test_combine(self):
+        a, b = cache.SolutionCache(4), cache.SolutionCache(8)
+        a.put("dp", SHORT)
+        a.get("dp", SHORT[0])
+        b.get("dp", SHORT[0])
+        total = cache.combine([a.stats(), b.stats()])
+        self.assertEqual(total["maxsize"], 12)
+        self.assertEqual(total["size"], 3)
+        self.assertEqual((total["hits"], total["misses"]), (1, 1))
+        self.assertEqual(total["hit_rate"], 0.5)
+        self.assertEqual(cache.combine([])["hit_rate"], 0.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
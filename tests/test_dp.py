@@ -0,0 +1,52 @@
+import random
+import unittest
+
+from puzzle import dp
+from puzzle import state as ps
+from tests.support import HARDEST, assert_path, scramble
+
+
+def sample_boards():
+    rng = random.Random(5)
+    boards = [ps.unpack(scramble(depth, rng)) for depth in (1, 5, 10, 20, 40, 80) for _ in range(5)]
+    return boards + list(HARDEST)
+
+
+class BidirectionalTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.table = dp.bfs_table(ps.GOAL)
+
+    def test_paths_are_as_short_as_the_table_says(self):
+        for start in sample_boards():
+            path = dp.bidirectional_path(start)
+            assert_path(self, path, start)
+            self.assertEqual(len(path) - 1, self.table[ps.rank(ps.pack(start))])
+
+    def test_smaller_boards(self):
+        rng = random.Random(6)
+        for rows, cols in ((2, 3), (2, 4), (3, 2)):
+            board = ps.get_board(rows, cols)
+            table = dp.bfs_table(board.goal, board=board)
+            for _ in range(20):
+                code = scramble(rng.randrange(60), rng, board)
+                start = board.unpack(code)
+                path = dp.bidirectional_path(start, board)
+                assert_path(self, path, start, board)
+                self.assertEqual(len(path) - 1, table[board.rank(code)])
+
+    def test_goal_is_its_own_path(self):
+        self.assertEqual(dp.bidirectional_path(ps.GOAL_TILES), [ps.GOAL_TILES])
+
+    def test_refuses_boards_larger_than_3x3(self):
+        board = ps.get_board(3, 4)
+        with self.assertRaises(ValueError):
+            dp.bidirectional_path(board.goal_tiles, board)
+
+    def test_unreachable_goal(self):
+        self.assertEqual(dp.bidirectional_path((2, 1, 3, 4, 5, 6, 7, 8, 0)), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
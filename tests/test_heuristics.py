@@ -0,0 +1,56 @@
+import random
+import unittest
+
+from puzzle import greedy
+from puzzle import heuristics
+from puzzle import state as ps
+from tests.support import scramble
+
+
+class DeltaTest(unittest.TestCase):
+
+    def assert_deltas_match(self, name):
+        rng = random.Random(17)
+        for rows, cols in ((3, 3), (2, 3), (3, 4), (4, 4)):
+            board = ps.get_board(rows, cols)
+            heuristic = getattr(heuristics.for_board(board), name)
+            update = heuristics.delta_for(heuristic)
+            self.assertIsNotNone(update)
+            for _ in range(200):
+                code = scramble(rng.randrange(80), rng, board)
+                blank = board.blank_index(code)
+                value = heuristic(code)
+                for child, target in board.neighbors(code, blank):
+                    self.assertEqual(update(value, code, blank, target), heuristic(child))
+
+    def test_manhattan_delta(self):
+        self.assert_deltas_match("manhattan")
+
+    def test_linear_conflict_delta(self):
+        self.assert_deltas_match("linear_conflict")
+
+    def test_module_functions_are_the_3x3_board(self):
+        self.assertEqual(heuristics.delta_for(heuristics.manhattan), heuristics.manhattan_delta)
+        self.assertEqual(heuristics.delta_for(heuristics.linear_conflict),
+                         heuristics.linear_conflict_delta)
+
+    def test_other_heuristics_have_no_delta(self):
+        self.assertIsNone(heuristics.delta_for(lambda code: 0))
+
+
+class GridWrapperTest(unittest.TestCase):
+
+    def test_greedy_grid_heuristics_follow_the_grid_shape(self):
+        rng = random.Random(23)
+        for rows, cols in ((3, 3), (2, 4), (3, 4), (4, 4)):
+            board = ps.get_board(rows, cols)
+            h = heuristics.for_board(board)
+            for _ in range(50):
+                code = scramble(rng.randrange(60), rng, board)
+                grid = board.to_grid(code)
+                self.assertEqual(greedy.manhattan(grid), h.manhattan(code))
+                self.assertEqual(greedy.linear_conflict(grid), h.linear_conflict(code))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,59 @@
+import os
+import random
+import unittest
+
+from puzzle import dp
+from puzzle import heuristics
+from puzzle import patterndb
+from puzzle import state as ps
+from tests.support import use_temp_data_dir
+
+
+class PatternDatabaseTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.data_dir = use_temp_data_dir(cls)
+        cls.pdb = patterndb.load_or_build()
+        cls.table = dp.bfs_table(ps.GOAL)
+        cls.sample = random.Random(13).sample(range(ps.NUM_STATES), 3000)
+
+    def test_admissible_and_at_least_manhattan(self):
+        for index in self.sample:
+            code = ps.unrank(index)
+            h = self.pdb(code)
+            self.assertLessEqual(h, self.table[index])
+            self.assertGreaterEqual(h, heuristics.manhattan(code))
+
+    def test_consistent(self):
+        for index in self.sample[:500]:
+            code = ps.unrank(index)
+            for child, _ in ps.neighbors(code, ps.blank_index(code)):
+                self.assertLessEqual(abs(self.pdb(child) - self.pdb(code)), 1)
+
+    def test_admissible_on_other_boards(self):
+        for rows, cols in ((2, 4), (4, 2)):
+            board = ps.get_board(rows, cols)
+            pdb = patterndb.load_or_build(board=board)
+            table = dp.bfs_table(board.goal, board=board)
+            manhattan = heuristics.for_board(board).manhattan
+            self.assertEqual(pdb(board.goal), 0)
+            for index in range(0, board.num_states, 7):
+                code = board.unrank(index)
+                self.assertLessEqual(pdb(code), table[index])
+                self.assertGreaterEqual(pdb(code), manhattan(code))
+
+    def test_goal_is_zero(self):
+        self.assertEqual(self.pdb(ps.GOAL), 0)
+
+    def test_tables_are_reloaded_from_disk(self):
+        for group in patterndb.DEFAULT_GROUPS:
+            self.assertTrue(os.path.exists(patterndb.table_path(group)))
+        reloaded = patterndb.load_or_build()
+        for index in self.sample[:500]:
+            code = ps.unrank(index)
+            self.assertEqual(reloaded(code), self.pdb(code))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,180 @@
+import asyncio
+import json
+import unittest
+
+from puzzle import service
+from puzzle import state as ps
+from tests.support import use_temp_data_dir
+
+HARDEST = [8, 6, 7, 2, 5, 4, 3, 0, 1]       # 31 moves
+# IDA* needs minutes on this 4x4 board, long enough to cancel or time out.
+SLOW = {"board": [15, 14, 13, 12, 11, 10, 9, 8, 7, 6, 5, 4, 3, 1, 2, 0],
+        "rows": 4, "cols": 4, "engine": "ida"}
+TIMEOUT = 30
+
+
+class Client:
+
+    def __init__(self, reader, writer):
+        self.reader = reader
+        self.writer = writer
+
+    async def send(self, message):
+        line = message if isinstance(message, str) else json.dumps(message)
+        self.writer.write(line.encode() + b"\n")
+        await self.writer.drain()
+
+    async def receive(self):
+        line = await asyncio.wait_for(self.reader.readline(), TIMEOUT)
+        if not line:
+            raise AssertionError("connection closed")
+        return json.loads(line)
+
+    async def reply(self, rid):
+        """Every line for request ``rid`` up to its closing one."""
+        lines = []
+        while True:
+            message = await self.receive()
+            if message["id"] != rid:
+                continue
+            lines.append(message)
+            if "move" not in message:
+                return lines
+
+    def close(self):
+        self.writer.close()
+
+
+class ServiceTest(unittest.IsolatedAsyncioTestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        # the workers are forked from this process and inherit the patch
+        use_temp_data_dir(cls)
+
+    async def asyncSetUp(self):
+        self.service = service.SolveService(workers=1, max_concurrent=1, deadline=10,
+                                            sizes=[(3, 3), (4, 4)])
+        listening = asyncio.Event()
+        self.server = asyncio.ensure_future(
+            service.serve(self.service, port=0, ready=lambda s: self._ready(s, listening)))
+        await asyncio.wait_for(listening.wait(), 120)
+        self.clients = []
+
+    def _ready(self, server, listening):
+        self.port = server.sockets[0].getsockname()[1]
+        listening.set()
+
+    async def asyncTearDown(self):
+        for client in self.clients:
+            client.close()
+        self.server.cancel()
+        with self.assertRaises(asyncio.CancelledError):
+            await self.server
+
+    async def connect(self):
+        client = Client(*await asyncio.open_connection("127.0.0.1", self.port))
+        self.clients.append(client)
+        return client
+
+    def assert_solution(self, lines, start, moves):
+        path = [tuple(line["move"]) for line in lines[:-1]]
+        self.assertEqual(lines[-1], {"id": lines[-1]["id"], "done": True, "moves": moves})
+        self.assertEqual(path[0], tuple(start))
+        self.assertEqual(path[-1], ps.GOAL_TILES)
+        self.assertEqual(len(path), moves + 1)
+        for a, b in zip(path, path[1:]):
+            self.assertIn(ps.pack(b), [n for n, _ in ps.neighbors(ps.pack(a), a.index(0))])
+
+    async def test_solves_with_every_engine(self):
+        client = await self.connect()
+        for engine in ("dp", "ida"):
+            await client.send({"id": engine, "board": HARDEST, "engine": engine})
+            self.assert_solution(await client.reply(engine), HARDEST, 31)
+        for engine in ("dnc", "greedy"):
+            await client.send({"id": engine, "board": HARDEST, "engine": engine})
+            lines = await client.reply(engine)
+            self.assert_solution(lines, HARDEST, lines[-1]["moves"])
+
+    async def test_unsolvable_board(self):
+        client = await self.connect()
+        await client.send({"id": 1, "board": [2, 1, 3, 4, 5, 6, 7, 8, 0]})
+        self.assertEqual(await client.reply(1), [{"id": 1, "done": True, "moves": -1}])
+
+    async def test_malformed_requests(self):
+        client = await self.connect()
+        await client.send("not json")
+        self.assertIn("error", await client.receive())
+        await client.send({"id": [1]})
+        self.assertIn("error", await client.receive())
+        await client.send({"board": HARDEST})
+        self.assertIn("error", await client.receive())
+        for rid, request in enumerate([
+                {"board": [1, 2, 3]},
+                {"board": HARDEST, "engine": "quantum"},
+                {"board": HARDEST, "rows": 5, "cols": 5},
+                {"board": SLOW["board"], "rows": 4, "cols": 4, "engine": "dp"},
+                {"board": HARDEST, "deadline": -1},
+                {"board": HARDEST, "deadline": float("nan")},
+                {"board": HARDEST, "deadline": float("inf")}]):
+            await client.send(dict(request, id=rid))
+            reply = await client.reply(rid)
+            self.assertEqual(len(reply), 1)
+            self.assertIn("error", reply[0])
+        # the connection is still usable
+        await client.send({"id": "ok", "board": HARDEST})
+        self.assert_solution(await client.reply("ok"), HARDEST, 31)
+
+    async def test_duplicate_and_unknown_ids(self):
+        client = await self.connect()
+        await client.send(dict(SLOW, id="slow"))
+        await client.send(dict(SLOW, id="slow"))
+        self.assertIn("error", await client.receive())
+        await client.send({"cancel": "nothing"})
+        self.assertEqual((await client.receive())["error"], "no such request")
+        await client.send({"cancel": "slow"})
+        self.assertEqual(await client.receive(), {"id": "slow", "cancelled": True})
+
+    async def test_cancel(self):
+        client = await self.connect()
+        await client.send(dict(SLOW, id="slow", deadline=2))
+        await asyncio.sleep(0.2)
+        await client.send({"cancel": "slow"})
+        self.assertEqual(await client.receive(), {"id": "slow", "cancelled": True})
+        # the only slot is free again once the worker reaches the deadline
+        await client.send({"id": "next", "board": HARDEST})
+        self.assert_solution(await client.reply("next"), HARDEST, 31)
+
+    async def test_deadline(self):
+        client = await self.connect()
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        await client.send(dict(SLOW, id="slow", deadline=0.5))
+        self.assertEqual(await client.reply("slow"), [{"id": "slow", "error": "deadline exceeded"}])
+        self.assertLess(loop.time() - start, 2)
+        await client.send({"id": "next", "board": HARDEST})
+        self.assert_solution(await client.reply("next"), HARDEST, 31)
+
+    async def test_client_disconnect(self):
+        client = await self.connect()
+        await client.send(dict(SLOW, id="slow", deadline=1))
+        await asyncio.sleep(0.2)
+        client.close()
+        other = await self.connect()
+        await other.send({"id": "next", "board": HARDEST})
+        self.assert_solution(await other.reply("next"), HARDEST, 31)
+
+    async def test_stats(self):
+        client = await self.connect()
+        for rid in (1, 2):
+            await client.send({"id": rid, "board": HARDEST})
+            await client.reply(rid)
+        await client.send({"id": "s", "stats": True})
+        stats = (await client.receive())["stats"]
+        self.assertEqual(stats["workers"], 1)
+        self.assertEqual((stats["hits"], stats["misses"]), (1, 1))
+        self.assertEqual(stats["size"], 32)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,98 @@
+import random
+import unittest
+
+from puzzle import state as ps
+from tests.support import scramble, swap_tiles
+
+
+class RankTest(unittest.TestCase):
+
+    def test_rank_is_a_bijection(self):
+        codes = [ps.unrank(i) for i in range(ps.NUM_STATES)]
+        self.assertEqual(len(set(codes)), ps.NUM_STATES)
+        for i, code in enumerate(codes):
+            self.assertEqual(ps.rank(code), i)
+
+    def test_rank_is_a_bijection_on_small_boards(self):
+        for rows, cols in ((2, 2), (2, 3), (3, 2)):
+            board = ps.get_board(rows, cols)
+            codes = [board.unrank(i) for i in range(board.num_states)]
+            self.assertEqual(len(set(codes)), board.num_states)
+            for i, code in enumerate(codes):
+                self.assertTrue(board.is_solvable(code))
+                self.assertEqual(board.rank(code), i)
+
+    def test_round_trip_on_larger_boards(self):
+        rng = random.Random(7)
+        for rows, cols in ((3, 4), (4, 3), (4, 4)):
+            board = ps.get_board(rows, cols)
+            for _ in range(200):
+                code = scramble(80, rng, board)
+                index = board.rank(code)
+                self.assertTrue(0 <= index < board.num_states)
+                self.assertEqual(board.unrank(index), code)
+
+    def test_scrambles_round_trip(self):
+        rng = random.Random(7)
+        for _ in range(500):
+            code = scramble(60, rng)
+            index = ps.rank(code)
+            self.assertTrue(0 <= index < ps.NUM_STATES)
+            self.assertEqual(ps.unrank(index), code)
+
+    def test_goal_ranks_and_unranks(self):
+        self.assertEqual(ps.unrank(ps.rank(ps.GOAL)), ps.GOAL)
+
+    def test_unreachable_board_has_no_rank(self):
+        with self.assertRaises(ValueError):
+            ps.rank(swap_tiles(ps.GOAL))
+        board = ps.get_board(4, 4)
+        with self.assertRaises(ValueError):
+            board.rank(swap_tiles(board.goal, board))
+
+
+
+class SolvableTest(unittest.TestCase):
+
+    def test_scrambles_are_solvable_and_swaps_are_not(self):
+        rng = random.Random(11)
+        for rows, cols in ((2, 3), (3, 3), (3, 4), (4, 4), (2, 5)):
+            board = ps.get_board(rows, cols)
+            for _ in range(100):
+                code = scramble(rng.randrange(80), rng, board)
+                self.assertTrue(board.is_solvable(code))
+                self.assertFalse(board.is_solvable(swap_tiles(code, board)))
+
+    def test_unsolvable_boards_reach_each_other(self):
+        code = swap_tiles(ps.GOAL)
+        other = swap_tiles(ps.pack((1, 2, 3, 4, 5, 6, 7, 0, 8)))
+        self.assertTrue(ps.is_solvable(other, code))
+        self.assertFalse(ps.is_solvable(other))
+
+    def test_agrees_with_rank_on_random_permutations(self):
+        rng = random.Random(3)
+        for _ in range(500):
+            tiles = list(range(9))
+            rng.shuffle(tiles)
+            code = ps.pack(tiles)
+            try:
+                ps.rank(code)
+                ranked = True
+            except ValueError:
+                ranked = False
+            self.assertEqual(ps.is_solvable(code), ranked)
+
+    def test_invalid_boards(self):
+        self.assertFalse(ps.is_solvable(ps.pack((1, 1, 3, 4, 5, 6, 7, 8, 0))))
+        with self.assertRaises(ValueError):
+            ps.parity_class(ps.pack((1, 1, 3, 4, 5, 6, 7, 8, 0)))
+
+    def test_exhaustive_searches_refuse_large_boards(self):
+        ps.check_exhaustive(ps.DEFAULT, "search")
+        ps.check_exhaustive(ps.get_board(2, 4), "search")
+        with self.assertRaises(ValueError):
+            ps.check_exhaustive(ps.get_board(4, 4), "search")
+
+
+if __name__ == "__main__":
+    unittest.main()
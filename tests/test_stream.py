@@ -0,0 +1,120 @@
+import random
+import unittest
+
+from puzzle import backtrack
+from puzzle import batch
+from puzzle import dnc
+from puzzle import dp
+from puzzle import greedy
+from puzzle import patterndb
+from puzzle import state as ps
+from puzzle import stream
+from tests.support import HARDEST, scramble, use_temp_data_dir
+
+
+def _greedy(start, explored):
+    grids = greedy.greedy_solver(ps.to_grid(ps.pack(start)), explored_states=explored)
+    return [ps.unpack(ps.from_grid(grid)) for grid in grids]
+
+
+def _iter_greedy(start, explore):
+    return greedy.iter_greedy(ps.to_grid(ps.pack(start)), explore=explore)
+
+
+# engine -> (list-returning function, generator)
+ENGINES = {
+    "greedy": (_greedy, _iter_greedy),
+    "astar": (lambda s, e: dnc.astar(s, explored_states=e),
+              lambda s, x: dnc.iter_astar(s, explore=x)),
+    "dnc": (lambda s, e: dnc.dnc_solver(s, explored_states=e),
+            lambda s, x: dnc.iter_dnc(s, explore=x)),
+    "dp": (lambda s, e: dp.reconstruct_path(s, explored_states=e),
+           lambda s, x: dp.iter_path(s, explore=x)),
+    "bidirectional": (lambda s, e: dp.bidirectional_path(s, explored_states=e),
+                      lambda s, x: dp.iter_bidirectional(s, explore=x)),
+    "backtracking": (lambda s, e: backtrack.pure_backtrack_simple(s, ps.GOAL_TILES, set(), [], e),
+                     lambda s, x: backtrack.iter_backtrack(s, ps.GOAL_TILES, set(), [], explore=x)),
+    "ida": (lambda s, e: backtrack.ida_star(s, e),
+            lambda s, x: backtrack.iter_ida(s, explore=x)),
+}
+
+
+class CancelAfter:
+    # a cancel flag that is set from its (n + 1)-th check on
+
+    def __init__(self, n):
+        self.n = n
+
+    def is_set(self):
+        self.n -= 1
+        return self.n < 0
+
+
+class StreamTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        use_temp_data_dir(cls)
+        dp.build_dp_table()
+        rng = random.Random(21)
+        cls.boards = [ps.unpack(scramble(depth, rng)) for depth in (0, 3, 12, 30)] + [HARDEST[0]]
+
+    def test_collected_events_match_the_list_functions(self):
+        for engine, (solve, events) in ENGINES.items():
+            for start in self.boards:
+                with self.subTest(engine=engine, start=start):
+                    explored = []
+                    path = solve(start, explored) or []
+                    collected = []
+                    self.assertEqual(stream.collect(events(start, True), collected), path)
+                    self.assertEqual(collected, explored)
+                    self.assertEqual(path[0], start)
+                    self.assertEqual(path[-1], ps.GOAL_TILES)
+
+    def test_without_explore_only_moves_are_yielded(self):
+        for engine, (solve, events) in ENGINES.items():
+            with self.subTest(engine=engine):
+                kinds = {kind for kind, _ in events(self.boards[2], False)}
+                self.assertEqual(kinds, {stream.MOVE})
+                self.assertEqual(list(stream.moves(events(self.boards[2], True))),
+                                 solve(self.boards[2], None))
+
+    def test_unsolvable_boards_yield_no_moves(self):
+        start = (2, 1, 3, 4, 5, 6, 7, 8, 0)
+        for engine, (_, events) in ENGINES.items():
+            with self.subTest(engine=engine):
+                self.assertEqual(list(stream.moves(events(start, False))), [])
+
+    def test_early_moves(self):
+        # The table walk and the row stages know their first move at once.
+        for events in (dp.iter_path(HARDEST[0]), dnc.iter_dnc(HARDEST[0])):
+            self.assertEqual(next(events), (stream.MOVE, HARDEST[0]))
+            events.close()
+
+    def test_cancel_stops_the_batch_engines(self):
+        for engine in batch.ENGINES:
+            with self.subTest(engine=engine):
+                explored = []
+                events = batch.iter_solve(engine, HARDEST[0], explore=True, cancel=CancelAfter(5))
+                path = stream.collect(events, explored)
+                self.assertLessEqual(len(explored), 6)
+                self.assertNotIn(ps.GOAL_TILES, path)
+
+    def test_ida_yields_each_expansion_at_once(self):
+        pdb = patterndb.default()
+        calls = []
+
+        def h(code):
+            calls.append(code)
+            return pdb(code)
+
+        events = backtrack.iter_ida(HARDEST[0], h, explore=True)
+        self.assertEqual(next(events), (stream.EXPLORE, HARDEST[0]))
+        self.assertEqual(next(events)[0], stream.EXPLORE)
+        # the start and at most its four children have been evaluated
+        self.assertLessEqual(len(calls), 5)
+        events.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,64 @@
+import os
+import tempfile
+import unittest
+
+from puzzle import patterndb
+from puzzle import state as ps
+from puzzle import tablefile
+
+
+class TableFileTest(unittest.TestCase):
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, "table.bin")
+        self.table = bytearray(range(256)) * 4
+
+    def load(self, goal, kind=tablefile.PATTERN, length=None):
+        table = tablefile.load(self.path, kind, goal, len(self.table) if length is None else length)
+        if table is not None:
+            self.addCleanup(table.obj.close)
+            self.addCleanup(table.release)
+        return table
+
+    def test_round_trip_for_every_board_size(self):
+        for rows, cols in ((3, 3), (4, 4), (3, 6), (4, 5), (5, 5)):
+            board = ps.get_board(rows, cols)
+            tablefile.save(self.path, tablefile.PATTERN, board.goal, self.table)
+            self.assertEqual(bytes(self.load(board.goal)), bytes(self.table))
+
+    def test_mismatches_are_rejected(self):
+        goal = ps.get_board(3, 6).goal
+        tablefile.save(self.path, tablefile.PATTERN, goal, self.table)
+        self.assertIsNone(self.load(ps.get_board(4, 5).goal))
+        self.assertIsNone(self.load(goal, kind=tablefile.DISTANCE))
+        self.assertIsNone(self.load(goal, length=len(self.table) - 1))
+
+    def test_corrupt_or_missing_files_are_rejected(self):
+        self.assertIsNone(self.load(ps.GOAL))
+        tablefile.save(self.path, tablefile.PATTERN, ps.GOAL, self.table)
+        with open(self.path, "r+b") as f:
+            f.seek(-1, os.SEEK_END)
+            f.write(b"\x00")
+        self.assertIsNone(self.load(ps.GOAL))
+
+    def test_pattern_database_for_a_board_over_16_cells(self):
+        board = ps.get_board(3, 6)
+        groups = ((1, 2), (3,))
+        with tempfile.TemporaryDirectory() as directory:
+            built = patterndb.load_or_build(groups, directory, board)
+            for group in groups:
+                path = patterndb.table_path(group, directory, board)
+                length = board.size ** (len(group) + 1)
+                table = tablefile.load(path, tablefile.PATTERN, board.goal, length)
+                self.assertIsNotNone(table)
+                table.release()
+            reloaded = patterndb.load_or_build(groups, directory, board)
+            self.assertEqual(reloaded(board.goal), 0)
+            code = board.move_blank(board.goal, board.size - 1, board.size - 2)
+            self.assertEqual(reloaded(code), built(code))
+
+
+if __name__ == "__main__":
+    unittest.main()
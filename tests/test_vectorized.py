@@ -0,0 +1,30 @@
+import threading
+import unittest
+
+from puzzle import dp
+from puzzle import state as ps
+from puzzle import vectorized
+
+
+class BfsTableTest(unittest.TestCase):
+
+    def test_same_table_and_progress_as_the_scalar_bfs(self):
+        scalar_layers, layers = [], []
+        expected = dp.bfs_table(ps.GOAL, lambda *a: scalar_layers.append(a))
+        table = vectorized.bfs_table(ps.GOAL, lambda *a: layers.append(a))
+        self.assertEqual(table, expected)
+        self.assertEqual(layers, scalar_layers)
+        self.assertEqual(layers[-1], (ps.NUM_STATES, 31))
+
+    def test_cancel(self):
+        cancel = threading.Event()
+        cancel.set()
+        self.assertIsNone(vectorized.bfs_table(ps.GOAL, cancel=cancel))
+
+    def test_batch_rank(self):
+        codes = [ps.unrank(i) for i in range(0, ps.NUM_STATES, 97)]
+        self.assertEqual(list(vectorized.rank(codes)), list(range(0, ps.NUM_STATES, 97)))
+
+
+if __name__ == "__main__":
+    unittest.main()